@@ -1,14 +1,34 @@
+# Started before any other import, so the startup time covers everything up to the first window
+import time
+startup_started = time.perf_counter()
+
 import tkinter as tk
 from ttkbootstrap import Style
 from datetime import datetime
 from ttkbootstrap.widgets import OptionMenu, Button, DateEntry
-from smartsheet_fetcher import SmartsheetFetcher
+from smartsheet_fetcher import SmartsheetFetcher, get_bearer_token
+from sheet_cache import SheetCache
 from clinic_turnover import ClinicTurnover
 from months_worked import MonthsWorked
+from batch_runner import compute_clinic_turnover, compute_months_worked, record_history
+from job_executor import JobExecutor, JobCancelled
+from instrumentation import metrics
+from result_sink import publish_results
 from datetime import datetime, timedelta
+import json
 import logging
 import os
 
+STARTUP_BUDGET_MS = 500  # Time allowed from launch until the window is responsive
+SHEET_LIST_CACHE_PATH = "./Cache/sheet_list.json"
+SHEET_LIST_TTL = timedelta(hours=1)
+METRICS_PATH = "./Logs/metrics.jsonl"  # One JSON line of stage timings and counters per report run
+HISTORY_DIR = "./History"
+
+# Per-stage metrics are on unless CLINIC_METRICS=0
+if os.environ.get("CLINIC_METRICS", "1") != "0":
+    metrics.enable()
+
 # Configure logging
 
 log_dir = "./Logs"
@@ -44,19 +64,28 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s',
     level=logging.DEBUG  # Log all levels (DEBUG, INFO, WARNING, ERROR, CRITICAL)
 )
-def get_bearer_token(file_path):
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Config file not found at {file_path}")
-    
-    with open(file_path, 'r') as file:
-        for line in file:
-            if line.startswith("BEARER_TOKEN="):
-                return line.strip().split('=', 1)[1]
-    
-    raise ValueError("BEARER_TOKEN not found in the config file")
-
-# Fetch sheet names using SmartsheetFetcher
+def load_cached_sheet_list(file_path, ttl):
+    """Return (sheets, is_fresh) from the on-disk sheet list cache, or ({}, False) if there is none."""
+    try:
+        with open(file_path, 'r') as file:
+            cached = json.load(file)
+        fetched_at = datetime.fromisoformat(cached['fetched_at'])
+        return cached['sheets'], datetime.now() - fetched_at <= ttl
+    except (OSError, ValueError, KeyError) as e:
+        logging.debug(f"No usable sheet list cache: {e}")
+        return {}, False
+
+
+def save_sheet_list(file_path, sheets):
+    """Write the sheet list to the on-disk cache."""
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w') as file:
+        json.dump({'fetched_at': datetime.now().isoformat(), 'sheets': sheets}, file)
+
+
+# Read the bearer token for SmartsheetFetcher
 config_file_path = "./config.txt"
+bearer_token = None
 try:
     bearer_token = get_bearer_token(config_file_path)
     logging.info(f"Bearer token fetched successfully: {bearer_token[:4]}******")
@@ -67,11 +96,16 @@ except ValueError as val_error:
 except Exception as e:
     logging.critical(f"Unexpected error occurred: {e}") 
 
-fetcher = SmartsheetFetcher(bearer_token)
-all_sheets_data = fetcher.fetch_all_sheets()
-sheet_names = list(all_sheets_data.keys())  
+fetcher = SmartsheetFetcher(bearer_token, cache=SheetCache("./Cache"))
+executor = JobExecutor()
+
+# The sheet list is loaded in the background; a fresh on-disk copy makes warm starts instant
+all_sheets_data, sheet_list_fresh = load_cached_sheet_list(SHEET_LIST_CACHE_PATH, SHEET_LIST_TTL)
+sheet_names = list(all_sheets_data.keys())
 
 dynamic_widgets = {}  # Dictionary to store references to dynamic widgets
+pending_upload = None  # Row upload of the last report that did not complete, see incomplete_upload
+history = None  # Report history store, opened on first use so pyarrow is not imported at startup
 
 def show_input_fields():
     """Display input fields based on the dropdown selection."""
@@ -124,6 +158,190 @@ def show_input_fields():
         dynamic_widgets['grant_end_date_picker'].grid(row=row, column=1, sticky="ew", padx=10, pady=5)
 
 
+def report_history():
+    """Return the report history store, opening it on first use. Returns None if it cannot be opened."""
+    global history
+    if history is None:
+        try:
+            from report_history import ReportHistoryStore
+            history = ReportHistoryStore(HISTORY_DIR)
+        except Exception as e:
+            logging.error(f"Could not open the report history: {e}")
+    return history
+
+
+def run_clinic_turnover(job, sheet1, sheet2, clinic_code, grant_start_date, grant_end_date):
+    """Fetch, compute, upload and export a Clinic Turnover report. Runs on the job worker thread."""
+    sheet_id1 = all_sheets_data[sheet1]
+    sheet_id2 = all_sheets_data[sheet2]
+
+    job.report("Fetching sheets...")
+    data_frames = fetcher.fetch_many([sheet_id1, sheet_id2], schema=ClinicTurnover.SCHEMA)
+    data_frame1 = data_frames[sheet_id1]
+    data_frame2 = data_frames[sheet_id2]
+
+    job.report("Computing turnover...")
+    results_df = compute_clinic_turnover(data_frame1, data_frame2, clinic_code, grant_start_date, grant_end_date)
+
+    job.report("Uploading to Smartsheet and writing Excel file...")
+    name = "Clinic_Turnover_Calculated" + str(sheet1)[:5] + str(sheet2)[:5]
+    published = publish_results(fetcher, name, results_df, results_df, results_df, "Files/" + name + ".xlsx")
+
+    job.report("Recording report history...")
+    record_history(report_history(), 'clinic_turnover', [data_frame1, data_frame2], results_df, grant_start_date, grant_end_date, clinic_code)
+    return incomplete_upload(name, published['create_response']['result']['id'], results_df, published['add_response'])
+
+
+def run_months_worked(job, sheet1, grant_start_date_dt, grant_end_date_dt):
+    """Fetch, compute, upload and export a Months Worked report. Runs on the job worker thread."""
+    sheet_id1 = all_sheets_data[sheet1]
+
+    job.report("Fetching sheet...")
+    data_frame1 = fetcher.fetch_smartsheet_data(sheet_id1, schema=MonthsWorked.SCHEMA)
+    logging.info(f"Fetched data for Sheet 1 ({sheet1})")
+
+    job.report("Computing months worked...")
+    results_df, staff_summary_df = compute_months_worked(data_frame1, grant_start_date_dt, grant_end_date_dt)
+
+    job.report("Uploading to Smartsheet and writing Excel file...")
+    name = "Months_Worked_Multiple_Calculated" + str(sheet_id1)
+    published = publish_results(fetcher, name, staff_summary_df, results_df, staff_summary_df, "Files/" + name + ".xlsx")
+
+    job.report("Recording report history...")
+    record_history(report_history(), 'months_worked', [data_frame1], results_df, grant_start_date_dt, grant_end_date_dt)
+    return incomplete_upload(name, published['create_response']['result']['id'], results_df, published['add_response'])
+
+
+def incomplete_upload(sheet_name, sheet_id, rows_df, add_response):
+    """Return what is needed to resume a row upload that did not complete, or None if every batch arrived."""
+    if not add_response.get('failedBatches'):
+        return None
+    return {
+        'sheet_name': sheet_name,
+        'sheet_id': sheet_id,
+        'rows_df': rows_df,
+        'completed_batches': add_response['completedBatches'],
+        'failed_batches': add_response['failedBatches']
+    }
+
+
+def resume_upload(job, upload):
+    """Send the row batches of an incomplete upload that have not arrived yet. Runs on the job worker thread."""
+    job.report(f"Resuming upload to {upload['sheet_name']}...")
+    add_response = fetcher.add_rows_to_sheet(upload['sheet_id'], upload['rows_df'], completed_batches=upload['completed_batches'])
+    return incomplete_upload(upload['sheet_name'], upload['sheet_id'], upload['rows_df'], add_response)
+
+
+def load_sheet_list(job):
+    """Fetch the sheet list from Smartsheet and cache it on disk. Runs on the job worker thread."""
+    if bearer_token is None:
+        raise ValueError("No bearer token configured")
+    job.report("Loading sheet list...")
+    sheets = fetcher.fetch_all_sheets()
+    if sheets:
+        save_sheet_list(SHEET_LIST_CACHE_PATH, sheets)
+    return sheets
+
+
+def update_sheet_list(sheets):
+    """Replace the known sheets and refresh any sheet dropdowns currently shown."""
+    global all_sheets_data, sheet_names
+    all_sheets_data = sheets
+    sheet_names = list(sheets.keys())
+    for key, variable in (('dropdown1', dropdown1), ('dropdown2', dropdown2)):
+        widget = dynamic_widgets.get(key)
+        if widget is not None and widget.winfo_exists():
+            widget.set_menu(variable.get(), "Select Sheet", *sheet_names)
+    logging.info(f"Sheet list loaded: {len(sheet_names)} sheets")
+
+
+def sheet_list_loaded(sheets):
+    update_sheet_list(sheets)
+    show_alert("")
+
+
+def sheet_list_failed(error):
+    logging.error(f"Could not load the sheet list: {error}")
+    if not sheet_names:
+        show_alert("Could not load the sheet list. Check the log and restart.")
+    else:
+        show_alert("Could not refresh the sheet list; using cached sheets.", clear_after=2000)
+
+
+def log_startup_time():
+    elapsed_ms = (time.perf_counter() - startup_started) * 1000
+    if elapsed_ms > STARTUP_BUDGET_MS:
+        logging.warning(f"Startup took {elapsed_ms:.0f} ms, over the {STARTUP_BUDGET_MS} ms budget")
+    else:
+        logging.info(f"Startup took {elapsed_ms:.0f} ms (budget {STARTUP_BUDGET_MS} ms)")
+
+
+def show_alert(text, clear_after=None):
+    """Show a message in the alert label, optionally clearing it after `clear_after` milliseconds."""
+    alert_label.config(text=text)
+    if clear_after is not None:
+        root.after(clear_after, lambda: alert_label.config(text="") if alert_label.cget("text") == text else None)
+
+
+def report_finished(upload):
+    """Show the outcome of a report job, offering a resume when some rows were not uploaded."""
+    global pending_upload
+    pending_upload = upload
+    if upload is None:
+        resume_button.config(state="disabled")
+        show_alert("File Generated and Uploaded", clear_after=2000)
+    else:
+        resume_button.config(state="normal")
+        show_alert(f"File Generated, but {len(upload['failed_batches'])} row batches were not uploaded to "
+                   f"{upload['sheet_name']}. Click Resume Upload to send them.")
+
+
+def resume_pending_upload():
+    if pending_upload is None:
+        show_alert("Nothing to resume.", clear_after=2000)
+        return
+    resume_button.config(state="disabled")
+    submit_job("Resume Upload", resume_upload, pending_upload)
+
+
+def submit_job(name, func, *args):
+    """Queue a report job on the background executor and route its progress to the alert label."""
+    def on_error(error):
+        if isinstance(error, JobCancelled):
+            show_alert(f"{name} cancelled.", clear_after=2000)
+        else:
+            show_alert(f"Error processing {name}.", clear_after=2000)
+
+    def run_instrumented(job):
+        # Jobs run one at a time, so the shared metrics describe exactly this run
+        metrics.reset()
+        try:
+            return func(job, *args)
+        finally:
+            metrics.log_summary(name)
+            metrics.write(METRICS_PATH, report=name, cancelled=job.cancelled)
+
+    if executor.is_busy():
+        show_alert(f"{name} queued ({executor.pending_count() + 1} waiting).")
+    executor.submit(
+        name,
+        run_instrumented,
+        on_progress=show_alert,
+        on_done=report_finished,
+        on_error=on_error
+    )
+
+
+def cancel_jobs():
+    executor.cancel_all()
+    show_alert("Cancelling...")
+
+
+def process_job_events():
+    executor.process_events()
+    root.after(100, process_job_events)
+
+
 def submit():
     selected_option = dropdown.get()
     if selected_option == "Clinic Turnover":
@@ -141,30 +359,14 @@ def submit():
             grant_end_date = datetime.strptime(grant_end_date, '%m/%d/%Y').strftime("%m-%d-%Y")
         except ValueError as e:
             logging.error(f"Error parsing dates: {e}")
-            alert_label.config(text="Invalid date format. Please select valid dates.")
+            show_alert("Invalid date format. Please select valid dates.", clear_after=2000)
             return
 
         if sheet1 != "Select Sheet" and sheet2 != "Select Sheet":
-            sheet_id1 = all_sheets_data[sheet1]
-            sheet_id2 = all_sheets_data[sheet2]
-            try:
-                # Fetch data for both sheets as DataFrames
-                data_frame1 = fetcher.fetch_smartsheet_data(sheet_id1)
-                data_frame2 = fetcher.fetch_smartsheet_data(sheet_id2)
-                clinic_turnover = ClinicTurnover(data_frame1, data_frame2, clinic_code, grant_start_date, grant_end_date)
-                results_df = clinic_turnover.process_data()
-                create_response = fetcher.create_new_sheet("Clinic_Turnover_Calculated" + str(sheet1)[:5] + str(sheet2)[:5], results_df)
-                sheet_id = create_response['result']['id']
-                add_response = fetcher.add_rows_to_sheet(sheet_id, results_df)
-                results_df.to_excel("Files/Clinic_Turnover_Calculated" + str(sheet1)[:5] + str(sheet2)[:5] + ".xlsx", index=False)
-                alert_label.config(text="File Generated and Uploaded")
-            except Exception as e:
-                logging.error(f"Error processing Clinic Turnover: {e}")
-                logging.debug("Detailed traceback:", exc_info=True)
-                alert_label.config(text="Error processing Clinic Turnover.")
+            submit_job("Clinic Turnover", run_clinic_turnover, sheet1, sheet2, clinic_code, grant_start_date, grant_end_date)
         else:
             logging.warning("Please select both sheets.")
-            alert_label.config(text="Please select both sheets.")
+            show_alert("Please select both sheets.", clear_after=2000)
         
     elif selected_option == "Months Worked + Staffing Ratio + Head Count":
         grant_start_date = dynamic_widgets['grant_start_date_picker'].entry.get()
@@ -176,40 +378,19 @@ def submit():
             grant_end_date_dt = datetime.strptime(grant_end_date, '%m/%d/%Y')
         except ValueError as e:
             logging.error(f"Error parsing dates: {e}")
-            alert_label.config(text="Invalid date format. Please select valid dates.")
+            show_alert("Invalid date format. Please select valid dates.", clear_after=2000)
             return
 
         sheet1 = dropdown1.get()
         
         if sheet1 != "Select Sheet":
-            sheet_id1 = all_sheets_data[sheet1]
-            try:
-                # Fetch data for the selected sheet as a DataFrame
-                data_frame1 = fetcher.fetch_smartsheet_data(sheet_id1)
-                logging.info(f"Fetched data for Sheet 1 ({sheet1})")
-                calculator = MonthsWorked(data_frame1, grant_start_date_dt, grant_end_date_dt)
-                results_df = calculator.get_results()
-                headcount_df = calculator.add_headcount_column(results_df)
-                month_difference = (grant_end_date_dt.year - grant_start_date_dt.year) * 12 + grant_end_date_dt.month - grant_start_date_dt.month
-                staff_summary_df = calculator.generate_summary(headcount_df, month_difference)
-                create_response = fetcher.create_new_sheet("Months_Worked_Multiple_Calculated" + str(sheet_id1), staff_summary_df)
-                sheet_id = create_response['result']['id']
-                add_response = fetcher.add_rows_to_sheet(sheet_id, results_df)
-                staff_summary_df.to_excel("Files/Months_Worked_Multiple_Calculated" + str(sheet_id1) + ".xlsx", index=False)
-                alert_label.config(text="File Generated and Uploaded")
-            except Exception as e:
-                logging.error(f"Error processing Months Worked: {e}")
-                logging.debug("Detailed traceback:", exc_info=True)
-                alert_label.config(text="Error processing Months Worked.")
+            submit_job("Months Worked", run_months_worked, sheet1, grant_start_date_dt, grant_end_date_dt)
         else:
             logging.warning("Please select a sheet.")
-            alert_label.config(text="Please select a sheet.")
+            show_alert("Please select a sheet.", clear_after=2000)
     else:
         logging.warning("Invalid option selected.")
-        alert_label.config(text="Invalid option selected.")
-
-    # Clear alert after 2 seconds
-    root.after(2000, lambda: alert_label.config(text=""))
+        show_alert("Invalid option selected.", clear_after=2000)
 
 root = tk.Tk()
 style = Style(theme="darkly")
@@ -248,6 +429,23 @@ alert_label = tk.Label(root, text="", font=("Arial", 10), fg="green", bg=style.c
 alert_label.pack(pady=(5, 0))
 
 submit_button = Button(root, text="Submit", command=submit, width=10, style="Submit.TButton")
-submit_button.pack(pady=20)
+submit_button.pack(pady=(20, 5))
+
+cancel_button = Button(root, text="Cancel", command=cancel_jobs, width=10, style="Submit.TButton")
+cancel_button.pack(pady=5)
+
+resume_button = Button(root, text="Resume Upload", command=resume_pending_upload, width=14, style="Submit.TButton", state="disabled")
+resume_button.pack(pady=5)
+
+process_job_events()
+if not sheet_list_fresh:
+    executor.submit(
+        "Load sheet list",
+        load_sheet_list,
+        on_progress=show_alert,
+        on_done=sheet_list_loaded,
+        on_error=sheet_list_failed
+    )
+root.after_idle(log_startup_time)
 
 root.mainloop()
@@ -0,0 +1,293 @@
+"""
+Headless batch runner for Months Worked and Clinic Turnover reports.
+
+Processes every entry of a JSON manifest in one run. All sheets are downloaded up front through a
+single SmartsheetFetcher (one HTTP connection pool and one sheet cache), the CPU-bound report
+calculations run on a process pool, and results are uploaded from the parent process while their
+Excel files are written alongside.
+
+Manifest format (JSON list):
+
+    [
+        {"report": "months_worked", "sheet_id": 123, "grant_start_date": "2023-07-01",
+         "grant_end_date": "2024-06-30"},
+        {"report": "clinic_turnover", "sheet_ids": [456, 789], "clinic_code": "ABC",
+         "grant_start_date": "2023-07-01", "grant_end_date": "2024-06-30"}
+    ]
+
+Usage:
+
+    python batch_runner.py manifest.json --workers 4 --report Files/batch_report.json
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from clinic_turnover import ClinicTurnover
+from instrumentation import metrics
+from months_worked import MonthsWorked
+from result_sink import publish_results
+from sheet_cache import SheetCache
+from smartsheet_fetcher import SmartsheetFetcher, get_bearer_token
+
+
+def compute_months_worked(data_frame, grant_start_date, grant_end_date):
+    """
+    Run the Months Worked calculation for one roster.
+
+    Args:
+    - data_frame (pd.DataFrame): The roster sheet.
+    - grant_start_date (datetime): Start of the grant period.
+    - grant_end_date (datetime): End of the grant period.
+
+    Returns:
+    - tuple: (results_df, staff_summary_df)
+    """
+    calculator = MonthsWorked(data_frame, grant_start_date, grant_end_date)
+    results_df = calculator.get_results()
+    headcount_df = calculator.add_headcount_column(results_df)
+    staff_summary_df = calculator.generate_summary(headcount_df, _month_difference(grant_start_date, grant_end_date))
+    return results_df, staff_summary_df
+
+
+def _month_difference(grant_start_date, grant_end_date):
+    return (grant_end_date.year - grant_start_date.year) * 12 + grant_end_date.month - grant_start_date.month
+
+
+def compute_clinic_turnover(data_frame1, data_frame2, clinic_code, grant_start_date, grant_end_date):
+    """
+    Run the Clinic Turnover calculation for one pair of yearly sheets.
+
+    Returns:
+    - pd.DataFrame: The processed turnover table.
+    """
+    clinic_turnover = ClinicTurnover(data_frame1, data_frame2, clinic_code, grant_start_date, grant_end_date)
+    return clinic_turnover.process_data()
+
+
+def record_history(history, report, input_frames, results_df, grant_start_date, grant_end_date, clinic_code=None):
+    """
+    Append a finished report run to the report history. Failures are logged, not raised, so a
+    history problem never fails the report itself.
+
+    Args:
+    - history (ReportHistoryStore): The history store; nothing is recorded when None.
+    - report (str): 'months_worked' or 'clinic_turnover'.
+    - input_frames (list): The sheet DataFrames the report was computed from.
+    - results_df (pd.DataFrame): The report's per-row results.
+    - grant_start_date (datetime or str): Start of the grant period.
+    - grant_end_date (datetime or str): End of the grant period.
+    - clinic_code (str): Clinic code of a Clinic Turnover report.
+    """
+    if history is None:
+        return
+    try:
+        grant_start_date = pd.Timestamp(grant_start_date).to_pydatetime()
+        grant_end_date = pd.Timestamp(grant_end_date).to_pydatetime()
+        if report == 'months_worked':
+            inputs_df = input_frames[0]
+            summary_df = MonthsWorked(inputs_df, grant_start_date, grant_end_date).generate_clinic_summaries(
+                results_df, _month_difference(grant_start_date, grant_end_date), include_network=False
+            )
+        else:
+            inputs_df = pd.concat([df.assign(**{'Source Sheet': i}) for i, df in enumerate(input_frames)], ignore_index=True)
+            summary_df = None
+        history.append(report, results_df, inputs_df, summary_df, clinic=clinic_code,
+                       grant_start_date=grant_start_date, grant_end_date=grant_end_date)
+    except Exception as e:
+        logging.error(f"Could not record {report} run in report history: {e}")
+        logging.debug("Detailed traceback:", exc_info=True)
+
+
+def _compute_entry(entry, data_frames, collect_metrics=False):
+    """
+    Compute one manifest entry. Runs in a worker process.
+
+    Returns:
+    - tuple: (sheet_name, upload_df, export_df, compute_seconds, metrics snapshot or None)
+    """
+    if collect_metrics:
+        metrics.reset()
+        metrics.enable()
+    name, upload_df, export_df, compute_seconds = _compute_report(entry, data_frames)
+    return name, upload_df, export_df, compute_seconds, metrics.snapshot() if collect_metrics else None
+
+
+def _compute_report(entry, data_frames):
+    start_time = time.perf_counter()
+    grant_start_date = datetime.strptime(entry['grant_start_date'], '%Y-%m-%d')
+    grant_end_date = datetime.strptime(entry['grant_end_date'], '%Y-%m-%d')
+
+    if entry['report'] == 'months_worked':
+        results_df, staff_summary_df = compute_months_worked(data_frames[0], grant_start_date, grant_end_date)
+        name = "Months_Worked_Multiple_Calculated" + str(entry['sheet_id'])
+        return name, results_df, staff_summary_df, time.perf_counter() - start_time
+
+    results_df = compute_clinic_turnover(data_frames[0], data_frames[1], entry['clinic_code'],
+                                         grant_start_date.strftime('%m-%d-%Y'), grant_end_date.strftime('%m-%d-%Y'))
+    sheet1, sheet2 = entry['sheet_ids']
+    name = "Clinic_Turnover_Calculated" + str(sheet1)[:5] + str(sheet2)[:5]
+    return name, results_df, results_df, time.perf_counter() - start_time
+
+
+def _entry_sheet_ids(entry):
+    if entry['report'] == 'months_worked':
+        return [entry['sheet_id']]
+    if entry['report'] == 'clinic_turnover':
+        if len(entry['sheet_ids']) != 2:
+            raise ValueError("clinic_turnover entries need exactly two sheet_ids")
+        return list(entry['sheet_ids'])
+    raise ValueError(f"Unknown report type: {entry['report']}")
+
+
+def load_manifest(file_path):
+    """
+    Load and validate a batch manifest.
+
+    Returns:
+    - list: The manifest entries.
+    """
+    with open(file_path, 'r') as file:
+        manifest = json.load(file)
+    if not isinstance(manifest, list):
+        raise ValueError("The manifest must be a JSON list of report entries")
+    for entry in manifest:
+        _entry_sheet_ids(entry)
+        for key in ('grant_start_date', 'grant_end_date'):
+            datetime.strptime(entry[key], '%Y-%m-%d')
+    return manifest
+
+
+def run_batch(manifest, fetcher, output_dir="Files", workers=None, upload=True, history=None):
+    """
+    Process every manifest entry and return the run report.
+
+    Args:
+    - manifest (list): Manifest entries, as returned by load_manifest.
+    - fetcher (SmartsheetFetcher): Shared fetcher used for all downloads and uploads.
+    - output_dir (str): Directory the Excel files are written to.
+    - workers (int): Number of compute processes. Defaults to the CPU count.
+    - upload (bool): Whether to create and fill result sheets on Smartsheet.
+    - history (ReportHistoryStore): Optional store every computed report is appended to.
+
+    Returns:
+    - dict: The run report, with per-entry status and timings.
+    """
+    run_started = time.perf_counter()
+    report = {'started_at': datetime.now().isoformat(), 'entries': []}
+
+    # Download every distinct sheet once, concurrently, through the shared fetcher. A sheet that
+    # fails to download only fails the entries that use it.
+    fetch_started = time.perf_counter()
+    roster_ids = [entry['sheet_id'] for entry in manifest if entry['report'] == 'months_worked']
+    turnover_ids = [sheet_id for entry in manifest if entry['report'] == 'clinic_turnover' for sheet_id in entry['sheet_ids']]
+    data_frames = fetcher.fetch_many(roster_ids, schema=MonthsWorked.SCHEMA, return_exceptions=True)
+    data_frames.update(fetcher.fetch_many(turnover_ids, schema=ClinicTurnover.SCHEMA, return_exceptions=True))
+    fetch_errors = {sheet_id: error for sheet_id, error in data_frames.items() if isinstance(error, Exception)}
+    report['fetch_seconds'] = time.perf_counter() - fetch_started
+    logging.info(f"Fetched {len(data_frames) - len(fetch_errors)} sheets in {report['fetch_seconds']:.3f}s "
+                 f"({len(fetch_errors)} failed)")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            None if any(sheet_id in fetch_errors for sheet_id in _entry_sheet_ids(entry)) else
+            executor.submit(_compute_entry, entry, [data_frames[sheet_id] for sheet_id in _entry_sheet_ids(entry)],
+                            metrics.enabled)
+            for entry in manifest
+        ]
+
+        for entry, future in zip(manifest, futures):
+            result = {'entry': entry, 'status': 'ok'}
+            if future is None:
+                failed_ids = [sheet_id for sheet_id in _entry_sheet_ids(entry) if sheet_id in fetch_errors]
+                logging.error(f"Batch entry {entry} skipped: could not fetch sheets {failed_ids}")
+                result['status'] = 'error'
+                result['error'] = "; ".join(str(fetch_errors[sheet_id]) for sheet_id in failed_ids)
+                report['entries'].append(result)
+                continue
+            try:
+                name, upload_df, export_df, result['compute_seconds'], worker_metrics = future.result()
+                if worker_metrics is not None:
+                    metrics.merge(worker_metrics)
+
+                output_path = os.path.join(output_dir, name + ".xlsx")
+                published = publish_results(fetcher, name, export_df, upload_df, export_df, output_path, upload=upload)
+                if upload:
+                    result['upload_seconds'] = published['upload_seconds']
+                    if published['add_response'].get('failedBatches'):
+                        # Enough to resume with add_rows_to_sheet(sheet_id, ..., completed_batches=...)
+                        result['status'] = 'partial_upload'
+                        result['sheet_id'] = published['create_response']['result']['id']
+                        result['completed_batches'] = published['add_response']['completedBatches']
+                        result['failed_batches'] = published['add_response']['failedBatches']
+                result['export_seconds'] = published['export_seconds']
+                result['publish_seconds'] = published['total_seconds']
+                result['output'] = output_path
+
+                if history is not None:
+                    record_history(history, entry['report'], [data_frames[sheet_id] for sheet_id in _entry_sheet_ids(entry)],
+                                   upload_df, entry['grant_start_date'], entry['grant_end_date'], entry.get('clinic_code'))
+            except Exception as e:
+                logging.error(f"Batch entry {entry} failed: {e}")
+                logging.debug("Detailed traceback:", exc_info=True)
+                result['status'] = 'error'
+                result['error'] = str(e)
+            report['entries'].append(result)
+
+    report['total_seconds'] = time.perf_counter() - run_started
+    if fetcher.cache is not None:
+        report['cache'] = fetcher.cache.stats()
+    if metrics.enabled:
+        report['metrics'] = metrics.snapshot()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Months Worked and Clinic Turnover reports for many clinics.")
+    parser.add_argument("manifest", help="Path to the JSON manifest of reports to run")
+    parser.add_argument("--config", default="./config.txt", help="Config file containing BEARER_TOKEN")
+    parser.add_argument("--workers", type=int, default=None, help="Number of compute processes")
+    parser.add_argument("--output-dir", default="Files", help="Directory for the Excel outputs")
+    parser.add_argument("--cache-dir", default="./Cache", help="Directory for the shared sheet cache")
+    parser.add_argument("--report", default=None, help="Path of the JSON run report")
+    parser.add_argument("--metrics", default=None, help="JSON Lines file to append per-stage timings and counters to")
+    parser.add_argument("--history-dir", default="./History", help="Directory of the report history dataset")
+    parser.add_argument("--no-history", action="store_true", help="Skip recording runs in the report history")
+    parser.add_argument("--no-upload", action="store_true", help="Skip creating result sheets on Smartsheet")
+    args = parser.parse_args()
+
+    logging.basicConfig(format='%(asctime)s - %(levelname)s - %(message)s', level=logging.INFO)
+
+    manifest = load_manifest(args.manifest)
+    os.makedirs(args.output_dir, exist_ok=True)
+    report_path = args.report or os.path.join(
+        args.output_dir, f"batch_report_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}.json"
+    )
+
+    if args.metrics:
+        metrics.enable()
+    if not args.no_history:
+        from report_history import ReportHistoryStore  # Imports pyarrow, so only when recording
+    with SmartsheetFetcher(get_bearer_token(args.config), cache=SheetCache(args.cache_dir)) as fetcher:
+        history = None if args.no_history else ReportHistoryStore(args.history_dir)
+        report = run_batch(manifest, fetcher, args.output_dir, args.workers, upload=not args.no_upload, history=history)
+    metrics.log_summary("Batch metrics")
+    if args.metrics:
+        metrics.write(args.metrics, manifest=args.manifest)
+
+    with open(report_path, 'w') as file:
+        json.dump(report, file, indent=2, default=str)
+    failed = sum(1 for result in report['entries'] if result['status'] != 'ok')
+    logging.info(f"Processed {len(report['entries'])} reports in {report['total_seconds']:.1f}s "
+                 f"({failed} with errors); report written to {report_path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
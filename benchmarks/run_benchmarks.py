@@ -0,0 +1,156 @@
+"""
+Performance benchmarks for MonthsWorked, ClinicTurnover and SmartsheetFetcher.
+
+Generates synthetic rosters and turnover sheets at each size, serves them from a local Smartsheet
+emulator, times the main pipeline steps and writes the results as JSON. Passing --compare with an earlier results file flags any benchmark
+that got slower than the allowed tolerance.
+
+Usage (from the repository root):
+
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 100000
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<earlier>.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from clinic_turnover import ClinicTurnover
+from months_worked import MonthsWorked
+from smartsheet_emulator import SmartsheetEmulator
+from smartsheet_fetcher import SmartsheetFetcher
+from synthetic import generate_roster, generate_turnover_sheets
+
+REPORT_START = datetime(2023, 7, 1)
+REPORT_END = datetime(2024, 6, 30)
+
+
+def time_call(func, repeat):
+    """
+    Run func `repeat` times and return (best seconds, result of the last call).
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_size(n_rows, fetcher, emulator, repeat):
+    """
+    Time every benchmark for one data size.
+
+    Returns:
+    - dict: Benchmark name to best time in seconds.
+    """
+    timings = {}
+    roster = generate_roster(n_rows)
+
+    roster_sheet_id = emulator.add_sheet_from_dataframe(f'Roster {n_rows}', roster)
+    timings['smartsheet_fetcher.fetch_smartsheet_data'], _ = time_call(
+        lambda: fetcher.fetch_smartsheet_data(roster_sheet_id, schema=MonthsWorked.SCHEMA), repeat
+    )
+    timings['smartsheet_fetcher.iter_smartsheet_data'], _ = time_call(
+        lambda: sum(len(page) for page in fetcher.iter_smartsheet_data(roster_sheet_id, schema=MonthsWorked.SCHEMA)),
+        repeat
+    )
+
+    calculator = MonthsWorked(roster, REPORT_START, REPORT_END)
+    timings['months_worked.get_results'], results_df = time_call(calculator.get_results, repeat)
+
+    headcount_df = calculator.add_headcount_column(results_df)
+    timings['months_worked.generate_summary'], summary_df = time_call(
+        lambda: calculator.generate_summary(headcount_df, 12), repeat
+    )
+
+    df_prev_year, df_curr_year = generate_turnover_sheets(n_rows)
+    timings['clinic_turnover.process_data'], _ = time_call(
+        lambda: ClinicTurnover(df_prev_year.copy(), df_curr_year.copy(), 'BENCH', '2023-07-01', '2024-06-30').process_data(),
+        repeat
+    )
+
+    create_response = fetcher.create_new_sheet('Benchmark', summary_df)
+    column_map = fetcher.fetch_column_map(create_response['result']['id'])
+    timings['smartsheet_fetcher.build_row_payloads'], _ = time_call(
+        lambda: fetcher.build_row_payloads(results_df, column_map), repeat
+    )
+    timings['smartsheet_fetcher.add_rows_to_sheet'], _ = time_call(
+        lambda: fetcher.add_rows_to_sheet(create_response['result']['id'], results_df), repeat
+    )
+    return timings
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results against a baseline results file.
+
+    Returns:
+    - list: (benchmark, size, baseline seconds, current seconds) for every regression.
+    """
+    regressions = []
+    for size, timings in results['results'].items():
+        for name, seconds in timings.items():
+            previous = baseline['results'].get(size, {}).get(name)
+            if previous is not None and seconds > previous * (1 + tolerance):
+                regressions.append((name, size, previous, seconds))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the report pipeline on synthetic data.")
+    parser.add_argument("--sizes", type=int, nargs='+', default=[1000, 10000, 100000], help="Row counts to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark; the best time is kept")
+    parser.add_argument("--output", default=None, help="Path of the JSON results file")
+    parser.add_argument("--compare", default=None, help="Earlier results file to check for regressions")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of simulated API latency per request")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before flagging a regression")
+    args = parser.parse_args()
+
+    emulator = SmartsheetEmulator(latency=args.latency).start()
+    fetcher = SmartsheetFetcher('benchmark', base_url=emulator.base_url)
+
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'results': {}
+    }
+    try:
+        for n_rows in args.sizes:
+            timings = run_size(n_rows, fetcher, emulator, args.repeat)
+            results['results'][str(n_rows)] = timings
+            for name, seconds in timings.items():
+                print(f"{n_rows:>8} rows  {name:<42} {seconds * 1000:10.1f} ms")
+    finally:
+        fetcher.close()
+        emulator.stop()
+
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'results', f"bench_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, size, previous, seconds in regressions:
+            print(f"REGRESSION {name} at {size} rows: {previous * 1000:.1f} ms -> {seconds * 1000:.1f} ms")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
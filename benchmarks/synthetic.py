@@ -0,0 +1,88 @@
+"""
+Synthetic roster and turnover data for benchmarks, shaped like the Smartsheet exports the
+reports consume.
+"""
+import numpy as np
+import pandas as pd
+
+from months_worked import MonthsWorked
+
+CLINICS = ['Clinic A', 'Clinic B', 'Clinic C', 'Clinic D', 'Clinic E', 'Clinic F']
+
+
+def _format_dates(dates):
+    """Format a DatetimeIndex as 'YYYY-MM-DD' strings with None for NaT, like Smartsheet cells."""
+    return pd.Series(dates.strftime('%Y-%m-%d')).where(~dates.isna(), None).tolist()
+
+
+def generate_roster(n_rows, seed=0):
+    """
+    Generate a roster with the columns MonthsWorked expects.
+
+    About 15% of people have more than one stint (returning staff), about 10% of rows have leave
+    (some still open-ended), and about 40% of rows have no End Date.
+
+    Args:
+    - n_rows (int): Number of roster rows.
+    - seed (int): Random seed.
+
+    Returns:
+    - pd.DataFrame: The roster, with dates as strings.
+    """
+    rng = np.random.default_rng(seed)
+    n_people = max(1, int(n_rows * 0.85))
+    person = np.concatenate([np.arange(n_people), rng.integers(0, n_people, n_rows - n_people)])
+    rng.shuffle(person)
+
+    start = pd.Timestamp('2019-01-01') + pd.to_timedelta(rng.integers(0, 6 * 365, n_rows), unit='D')
+    tenure = pd.to_timedelta(rng.integers(30, 3 * 365, n_rows), unit='D')
+    end = pd.DatetimeIndex(start + tenure)
+    end = end.where(rng.random(n_rows) > 0.4, pd.NaT)
+
+    has_leave = rng.random(n_rows) < 0.1
+    leave_start = pd.DatetimeIndex(start + pd.to_timedelta(rng.integers(30, 400, n_rows), unit='D'))
+    leave_end = leave_start + pd.to_timedelta(rng.integers(10, 120, n_rows), unit='D')
+    leave_start = leave_start.where(has_leave, pd.NaT)
+    leave_end = leave_end.where(has_leave & (rng.random(n_rows) > 0.2), pd.NaT)
+
+    positions = np.array(MonthsWorked.ROLES_TO_TRACK)
+    fte = rng.choice([1.0, 1.0, 1.0, 0.5, 0.75, np.nan], n_rows)
+
+    return pd.DataFrame({
+        'Cohen Clinic': rng.choice(CLINICS, n_rows),
+        'Name': [f"Employee {p}" for p in person],
+        'Position': rng.choice(positions, n_rows),
+        'FTE': fte,
+        'Start Date': _format_dates(pd.DatetimeIndex(start)),
+        'End Date': _format_dates(end),
+        'Employee Leave (start date)': _format_dates(leave_start),
+        'Employee Leave (end date)': _format_dates(leave_end)
+    })
+
+
+def generate_turnover_sheets(n_rows, seed=0):
+    """
+    Generate a previous-year and current-year turnover sheet pair with n_rows rows in total,
+    spread evenly over the months of 2023 and 2024.
+
+    Returns:
+    - tuple: (df_prev_year, df_curr_year)
+    """
+    rng = np.random.default_rng(seed)
+    sheets = []
+    for year, n in ((2023, n_rows // 2), (2024, n_rows - n_rows // 2)):
+        month = np.sort(rng.integers(1, 13, n))
+        month_start = pd.to_datetime({'year': np.full(n, year), 'month': month, 'day': np.ones(n, dtype=int)})
+        month_end = month_start + pd.offsets.MonthEnd(0)
+        separated = rng.integers(0, 4, n)
+        employees = rng.integers(10, 40, n).astype(float)
+        sheets.append(pd.DataFrame({
+            'Primary Column': [f"Row {i}" for i in range(n)],
+            'Month #': month,
+            '# Separated Employees': separated,
+            'Avg # Employees': employees,
+            'Turnover': separated / employees,
+            'Month Start': month_start.dt.strftime('%Y-%m-%d'),
+            'Month End': month_end.dt.strftime('%Y-%m-%d')
+        }))
+    return sheets[0], sheets[1]
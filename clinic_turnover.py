@@ -3,6 +3,8 @@ import numpy as np
 import re  
 import openpyxl 
 
+from instrumentation import timed
+
 
 class ClinicTurnover:
     """
@@ -17,6 +19,16 @@ class ClinicTurnover:
     - grant_end_date (str): The end date of the grant year period.
     """
     
+    # Column types for turnover sheets, applied at ingest by SmartsheetFetcher.apply_schema
+    SCHEMA = {
+        'Month #': 'float64',
+        '# Separated Employees': 'float64',
+        'Avg # Employees': 'float64',
+        'Turnover': 'float64',
+        'Month Start': 'datetime64[ns]',
+        'Month End': 'datetime64[ns]'
+    }
+
     def __init__(self, df_prev_year, df_curr_year, clinic_code, grant_start_date, grant_end_date):
         """
         Initializes the ClinicDataProcessor with the required data and parameters.
@@ -54,6 +66,105 @@ class ClinicTurnover:
         self.grant_start_date = grant_start_date
         self.grant_end_date = grant_end_date
 
+    @classmethod
+    def from_chunks(cls, prev_year_chunks, curr_year_chunks, clinic_code, grant_start_date, grant_end_date):
+        """
+        Creates a ClinicTurnover from iterables of DataFrame chunks, such as the pages yielded by
+        SmartsheetFetcher.iter_smartsheet_data.
+
+        Parameters:
+        - prev_year_chunks (iterable): DataFrame chunks of the previous year's sheet.
+        - curr_year_chunks (iterable): DataFrame chunks of the current year's sheet.
+        - clinic_code (str): The code for the clinic.
+        - grant_start_date (str): The start date of the grant year period in 'YYYY-MM-DD' format.
+        - grant_end_date (str): The end date of the grant year period in 'YYYY-MM-DD' format.
+
+        Returns:
+        - ClinicTurnover: An instance over the combined chunks.
+        """
+        df_prev_year = pd.concat(list(prev_year_chunks))
+        df_curr_year = pd.concat(list(curr_year_chunks))
+        return cls(df_prev_year, df_curr_year, clinic_code, grant_start_date, grant_end_date)
+
+    @staticmethod
+    def rolling_turnover(yearly_sheets, window_months=12):
+        """
+        Computes trailing-window turnover over any number of yearly turnover sheets.
+
+        The sheets are combined into one monthly series. Rows for the same month within a sheet
+        are added together; where sheets overlap, the later sheet's month wins.
+        Separations and average headcount are summed over every window at once with cumulative
+        sums, so each window costs O(1) instead of being recomputed from scratch. Turnover for a
+        window is total separations divided by the mean of the monthly average headcounts, the
+        same ratio as the Total row of process_data.
+
+        Parameters:
+        - yearly_sheets (list): DataFrames with 'Month Start', '# Separated Employees' and 'Avg # Employees' columns.
+        - window_months (int): Length of the trailing window in months.
+
+        Returns:
+        - pd.DataFrame: One row per window ending in each month, with 'Window Start', 'Window End',
+          '# Separated Employees', 'Avg # Employees' and 'Turnover'. Windows containing a month
+          without data have NaN turnover.
+        """
+        required_columns = ['Month Start', '# Separated Employees', 'Avg # Employees']
+        for position, df in enumerate(yearly_sheets):
+            for col in required_columns:
+                if col not in df.columns:
+                    raise KeyError(f"Column '{col}' not found in sheet {position}")
+
+        output_columns = ['Window Start', 'Window End', '# Separated Employees', 'Avg # Employees', 'Turnover']
+        if not yearly_sheets:
+            return pd.DataFrame(columns=output_columns)
+
+        data = pd.concat([df[required_columns].assign(Sheet=position) for position, df in enumerate(yearly_sheets)], ignore_index=True)
+        try:
+            data['Month Start'] = pd.to_datetime(data['Month Start'])
+        except Exception as e:
+            raise ValueError(f"Error converting 'Month Start' to datetime: {e}")
+        data = data.dropna(subset=['Month Start'])
+        if data.empty:
+            return pd.DataFrame(columns=output_columns)
+
+        # Add up each sheet's rows per month, then keep the latest sheet's figures for each month
+        data['Month'] = data['Month Start'].dt.to_period('M')
+        for col in ('# Separated Employees', 'Avg # Employees'):
+            data[col] = pd.to_numeric(data[col])
+        per_sheet = data.groupby(['Sheet', 'Month'], sort=True)[['# Separated Employees', 'Avg # Employees']].sum(min_count=1)
+        monthly = per_sheet.reset_index().drop_duplicates('Month', keep='last').set_index('Month').sort_index()
+
+        # One row per calendar month, with gaps filled by NaN so windows never span missing data silently
+        months = pd.period_range(monthly.index.min(), monthly.index.max(), freq='M')
+        monthly = monthly.reindex(months)
+
+        separations = pd.to_numeric(monthly['# Separated Employees']).to_numpy(dtype=float)
+        headcounts = pd.to_numeric(monthly['Avg # Employees']).to_numpy(dtype=float)
+        valid = ~(np.isnan(separations) | np.isnan(headcounts))
+
+        if len(months) < window_months:
+            return pd.DataFrame(columns=output_columns)
+
+        def window_sums(values):
+            cumulative = np.concatenate([[0.0], np.cumsum(values)])
+            return cumulative[window_months:] - cumulative[:-window_months]
+
+        separation_sums = window_sums(np.where(valid, separations, 0.0))
+        average_headcounts = window_sums(np.where(valid, headcounts, 0.0)) / window_months
+        complete = window_sums(valid.astype(float)) == window_months
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            turnover = np.where(complete & (average_headcounts > 0), separation_sums / average_headcounts, np.nan)
+
+        window_ends = months[window_months - 1:]
+        return pd.DataFrame({
+            'Window Start': months[:len(window_ends)].to_timestamp(how='start'),
+            'Window End': window_ends.to_timestamp(how='end').normalize(),
+            '# Separated Employees': np.where(complete, separation_sums, np.nan),
+            'Avg # Employees': np.where(complete, average_headcounts, np.nan),
+            'Turnover': turnover
+        })
+
+    @timed('compute.process_data')
     def process_data(self):
         """
         Processes the clinic turnover data and prepares it for export to Excel.
@@ -70,12 +181,12 @@ class ClinicTurnover:
             if col not in self.df_curr_year.columns:
                 raise KeyError(f"Column '{col}' not found in df_curr_year")
 
-        # Convert date columns to datetime
+        # Convert date columns to datetime, unless they were already typed at ingest (see SCHEMA)
         try:
-            self.df_prev_year['Month Start'] = pd.to_datetime(self.df_prev_year['Month Start'])
-            self.df_prev_year['Month End'] = pd.to_datetime(self.df_prev_year['Month End'])
-            self.df_curr_year['Month Start'] = pd.to_datetime(self.df_curr_year['Month Start'])
-            self.df_curr_year['Month End'] = pd.to_datetime(self.df_curr_year['Month End'])
+            for df in (self.df_prev_year, self.df_curr_year):
+                for col in ('Month Start', 'Month End'):
+                    if not pd.api.types.is_datetime64_any_dtype(df[col]):
+                        df[col] = pd.to_datetime(df[col])
         except Exception as e:
             raise ValueError(f"Error converting 'Month Start' or 'Month End' to datetime: {e}")
 
@@ -90,8 +201,8 @@ class ClinicTurnover:
         if not pd.api.types.is_numeric_dtype(grant_year_data['Turnover']):
             raise TypeError("'Turnover' column must be numeric")
 
-        grant_year_data['Month Start'] = pd.to_datetime(grant_year_data['Month Start'])
-        grant_year_data['Month End'] = pd.to_datetime(grant_year_data['Month End'])
+        # Year of each month, taken before the dates are formatted as strings
+        year_keys = grant_year_data['Month Start'].dt.year
 
         # Formatting dates and percentages
         grant_year_data['Month Start'] = grant_year_data['Month Start'].dt.strftime('%m/%d/%y')
@@ -102,21 +213,19 @@ class ClinicTurnover:
         if grant_year_data['Month Start'].isnull().any():
             raise ValueError("'Month Start' contains null values after formatting")
 
-        # Insert year rows based on changes in the year
-        final_data = grant_year_data.copy()
-        years = final_data['Month Start'].apply(lambda x: x[-2:]).drop_duplicates().tolist()
-        year_rows = []
-
-        # Compute positions to insert year rows
-        for year in years:
-            year_position = final_data[final_data['Month Start'].str.endswith(year)].index.min()
-            year_rows.append((year_position, {'Primary Column': f"20{year}", 'Month #': np.nan, 
-                                              '# Separated Employees': np.nan, 'Avg # Employees': np.nan, 
-                                              'Turnover': '', 'Month Start': '', 'Month End': ''}))
-
-        # Insert year rows into the DataFrame
-        for index, year_row in reversed(year_rows):
-            final_data = pd.concat([final_data.iloc[:index], pd.DataFrame([year_row]), final_data.iloc[index:]]).reset_index(drop=True)
+        # Insert a year row before the first month of each year. Each year row is keyed half a
+        # position before its first month, so one concat and a stable sort builds the layout.
+        first_months = year_keys.drop_duplicates()
+        year_rows = pd.DataFrame({
+            'Primary Column': [f"20{year % 100:02d}" for year in first_months],
+            'Month #': np.nan,
+            '# Separated Employees': np.nan,
+            'Avg # Employees': np.nan,
+            'Turnover': '',
+            'Month Start': '',
+            'Month End': ''
+        }, index=first_months.index - 0.5)
+        final_data = pd.concat([grant_year_data, year_rows]).sort_index(kind='stable').reset_index(drop=True)
 
         # Append a row for the totals
         total_row_index = len(final_data) + 2  # Adjust for header and one-based index
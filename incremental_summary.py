@@ -0,0 +1,251 @@
+import logging
+import time
+
+import pandas as pd
+
+from months_worked import MonthsWorked
+
+
+class IncrementalStaffingSummary:
+    """
+    Keeps Months Worked results and staffing summary totals up to date as roster rows change.
+
+    The calculator remembers each row's contribution (months worked, FTE-adjusted months, role and
+    whether the employee is still working). Applying a diff subtracts the old contributions of
+    removed and changed rows and adds those of added and changed rows, so only the changed rows
+    are recalculated and the totals, per-role counts, Headcount and Currently Working Count are
+    updated by deltas.
+
+    Rows are identified by their DataFrame index, which must be stable between runs, e.g. the
+    Smartsheet row IDs kept by SheetSnapshotStore.
+    """
+
+    RESULT_COLUMNS = MonthsWorked.INPUT_COLUMNS + ['Months Worked', 'FTE-Adjusted Months Worked']
+
+    def __init__(self, report_start_date, report_end_date, grant_year=12):
+        """
+        Parameters:
+        - report_start_date (datetime or str): Start of the reporting period.
+        - report_end_date (datetime or str): End of the reporting period.
+        - grant_year (int): Number of months the staffing figures are divided by, as in generate_summary.
+        """
+        self.calculator = MonthsWorked(pd.DataFrame(columns=MonthsWorked.INPUT_COLUMNS), report_start_date, report_end_date)
+        self.grant_year = grant_year
+        self._rows = pd.DataFrame(columns=self.RESULT_COLUMNS)
+        self._pending = self._rows
+        self._removed = set()
+        self._fte_months = 0.0
+        self._role_totals = {}
+        self._currently_working = 0
+
+    @staticmethod
+    def _normalize(df):
+        """
+        Returns the input columns with categoricals as plain objects, so rows from different
+        fetches can be compared and stored together.
+        """
+        df = df[MonthsWorked.INPUT_COLUMNS]
+        categorical = [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+        return df.astype({col: object for col in categorical}) if categorical else df.copy()
+
+    def _contributions(self, rows):
+        months_worked, fte_adjusted_months = self.calculator.calculate_months_columnar(rows)
+        rows = rows.copy()
+        rows['Months Worked'] = months_worked
+        rows['FTE-Adjusted Months Worked'] = fte_adjusted_months
+        return rows
+
+    def _accumulate(self, rows, sign):
+        """
+        Adds (sign=1) or subtracts (sign=-1) the contributions of rows to the running totals.
+        """
+        if rows.empty:
+            return
+        self._fte_months += sign * rows['FTE-Adjusted Months Worked'].sum()
+        for role, total in rows.groupby('Position')['FTE-Adjusted Months Worked'].sum().items():
+            self._role_totals[role] = self._role_totals.get(role, 0.0) + sign * total
+        self._currently_working += sign * int(rows['End Date'].isna().sum())
+
+    def load(self, roster_df):
+        """
+        Computes the results for a full roster, replacing any previous state.
+
+        Parameters:
+        - roster_df (pd.DataFrame): The roster, indexed by stable row IDs.
+        """
+        self._rows = self._contributions(self._normalize(roster_df))
+        self._pending = self._rows.iloc[:0]
+        self._removed = set()
+        self._fte_months = 0.0
+        self._role_totals = {}
+        self._currently_working = 0
+        self._accumulate(self._rows, 1)
+
+    def refresh(self):
+        """
+        Recomputes every row and total from the stored roster, discarding accumulated rounding.
+        """
+        self._compact()
+        self.load(self._rows)
+
+    @staticmethod
+    def _join_ids(*indexes):
+        """
+        Concatenates row ID indexes, skipping missing and empty ones.
+        """
+        indexes = [index for index in indexes if index is not None and len(index)]
+        if not indexes:
+            return pd.Index([])
+        return indexes[0].append(indexes[1:]) if len(indexes) > 1 else indexes[0]
+
+    def _lookup(self, row_ids):
+        """
+        Returns the current stored rows for a set of row IDs, preferring not-yet-compacted updates.
+        """
+        pending = row_ids.isin(self._pending.index)
+        if not pending.any():
+            return self._rows.loc[row_ids]
+        return pd.concat([self._pending.loc[row_ids[pending]], self._rows.loc[row_ids[~pending]]])
+
+    def _compact(self):
+        """
+        Folds pending updates and removals into the stored rows, keeping the roster's row order.
+        """
+        if self._pending.empty and not self._removed:
+            return
+        rows = self._rows
+        if self._removed:
+            rows = rows[~rows.index.isin(list(self._removed))]
+        rows = rows.copy()
+        in_rows = self._pending.index.isin(rows.index)
+        if in_rows.any():
+            rows.loc[self._pending.index[in_rows], self.RESULT_COLUMNS] = self._pending[in_rows]
+        if not in_rows.all():
+            rows = pd.concat([rows, self._pending[~in_rows]]) if not rows.empty else self._pending[~in_rows]
+        self._rows = rows
+        self._pending = self._rows.iloc[:0]
+        self._removed = set()
+
+    def apply_diff(self, added=None, changed=None, removed=None):
+        """
+        Updates the results for a set of roster changes.
+
+        Only the changed rows are recalculated. Their new values are held apart from the stored
+        roster until the full results are requested, so the cost of a diff does not depend on the
+        size of the roster.
+
+        Parameters:
+        - added (pd.DataFrame): New rows, indexed by row ID.
+        - changed (pd.DataFrame): New values of existing rows, indexed by row ID.
+        - removed (iterable): IDs of deleted rows.
+        """
+        start_time = time.perf_counter()
+        updates = [self._normalize(rows) for rows in (changed, added) if rows is not None and not rows.empty]
+        removed = pd.Index(removed) if removed is not None else pd.Index([])
+
+        # Take out the old contributions of every row that is going away or changing
+        stale_ids = self._join_ids(removed, changed.index if changed is not None else None)
+        if len(stale_ids):
+            self._accumulate(self._lookup(stale_ids), -1)
+
+        fresh = self._contributions(pd.concat(updates) if len(updates) > 1 else updates[0]) if updates else None
+        if fresh is not None:
+            self._accumulate(fresh, 1)
+
+        # Rows already pending are updated where they are, so added rows keep their order
+        pending = self._pending[~self._pending.index.isin(removed)] if len(removed) else self._pending
+        if fresh is not None:
+            in_pending = fresh.index.isin(pending.index)
+            if in_pending.any():
+                pending = pending.copy()
+                pending.loc[fresh.index[in_pending], self.RESULT_COLUMNS] = fresh[in_pending]
+            if not in_pending.all():
+                pending = pd.concat([pending, fresh[~in_pending]]) if not pending.empty else fresh[~in_pending]
+        self._pending = pending
+        self._removed.update(removed)
+
+        logging.info(f"Applied roster diff ({0 if added is None else len(added)} added, "
+                     f"{0 if changed is None else len(changed)} changed, {len(removed)} removed) "
+                     f"in {time.perf_counter() - start_time:.3f}s")
+
+    def update(self, roster_df):
+        """
+        Diffs a new copy of the roster against the stored one by row ID and applies the changes.
+
+        The comparison touches every row, so prefer apply_diff when the changes are already known,
+        e.g. from a rowsModifiedSince sync.
+
+        Parameters:
+        - roster_df (pd.DataFrame): The current roster, indexed by the same row IDs as before.
+
+        Returns:
+        - dict: The 'added', 'changed' and 'removed' row IDs.
+        """
+        self._compact()
+        new = self._normalize(roster_df)
+        old = self._rows[MonthsWorked.INPUT_COLUMNS]
+
+        removed = old.index.difference(new.index, sort=False)
+        added = new.index.difference(old.index, sort=False)
+        common = new.index.intersection(old.index, sort=False)
+
+        before = old.loc[common]
+        after = new.loc[common]
+        different = (before != after) & ~(before.isna() & after.isna())
+        changed = common[different.any(axis=1).to_numpy()]
+
+        self.apply_diff(added=new.loc[added], changed=new.loc[changed], removed=removed)
+        return {'added': list(added), 'changed': list(changed), 'removed': list(removed)}
+
+    @property
+    def headcount(self):
+        """
+        The Headcount figure of add_headcount_column.
+        """
+        return self._fte_months / 12
+
+    def summary(self):
+        """
+        Returns the generate_summary figures plus 'Headcount' as a dictionary.
+        """
+        # The first row after compaction: the first stored row not removed, else the first pending row
+        first_id = next((row_id for row_id in self._rows.index[:len(self._removed) + 1] if row_id not in self._removed), None)
+        if first_id is not None and first_id in self._pending.index:
+            clinic_name = self._pending.at[first_id, 'Cohen Clinic']
+        elif first_id is not None:
+            clinic_name = self._rows.at[first_id, 'Cohen Clinic']
+        elif not self._pending.empty:
+            clinic_name = self._pending.iloc[0]['Cohen Clinic']
+        else:
+            clinic_name = 'Unknown Clinic'
+        summary = {
+            'Cohen Clinic': clinic_name,
+            'Headcount': self.headcount,
+            'Total Staff': self._fte_months / self.grant_year
+        }
+        for role in MonthsWorked.ROLES_TO_TRACK:
+            summary[f"# of {role}s"] = self._role_totals[role] / self.grant_year if role in self._role_totals else 0
+        summary['Leads + Clinicians'] = summary["# of Lead Clinicians"] + summary["# of Clinicians"]
+        summary['Currently Working Count'] = self._currently_working
+        return summary
+
+    def results(self):
+        """
+        Returns the per-row results in the layout of MonthsWorked.get_results.
+        """
+        self._compact()
+        return self._rows[self.RESULT_COLUMNS].copy()
+
+    def staff_summary(self):
+        """
+        Returns the results with the summary in the first row, in the layout produced by
+        add_headcount_column followed by generate_summary.
+        """
+        df = self.results().reset_index(drop=True)
+        summary = self.summary()
+        for col, value in summary.items():
+            if col in df.columns:
+                continue
+            df[col] = "" if col == 'Headcount' else None
+            df.at[0, col] = value
+        return df
@@ -0,0 +1,209 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+
+class _NullStage:
+    """
+    Stage returned while metrics are disabled; entering, leaving and counting do nothing.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def add_rows(self, rows):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """
+    Times one execution of a named stage and records it on exit.
+    """
+
+    __slots__ = ('_metrics', '_name', '_start', '_rows')
+
+    def __init__(self, metrics, name):
+        self._metrics = metrics
+        self._name = name
+        self._rows = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._metrics._record(self._name, time.perf_counter() - self._start, self._rows)
+        return False
+
+    def add_rows(self, rows):
+        """
+        Adds to the number of rows processed by this stage.
+        """
+        self._rows += rows
+
+
+class PipelineMetrics:
+    """
+    Collects per-stage timings and counters for the report pipeline.
+
+    Stages (fetch, parse, dataframe, compute.*, upload, export) record their call count, total and
+    longest duration and rows processed. Counters record totals such as HTTP requests, bytes
+    transferred and retries. Recording is thread-safe. While disabled, stage() returns a shared
+    no-op object and count() returns immediately, so instrumented code costs one attribute check.
+
+    Attributes:
+    - enabled (bool): Whether stages and counters are being recorded.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """
+        Clears all recorded stages and counters.
+        """
+        with self._lock:
+            self._stages = {}
+            self._counters = {}
+
+    def stage(self, name):
+        """
+        Returns a context manager timing one execution of a stage.
+
+        Parameters:
+        - name (str): Stage name, e.g. 'fetch' or 'compute.get_results'.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def count(self, name, value=1):
+        """
+        Adds to a counter.
+
+        Parameters:
+        - name (str): Counter name, e.g. 'http.bytes_received'.
+        - value (int): Amount to add.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def _record(self, name, seconds, rows):
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                stats = self._stages[name] = {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'rows': 0}
+            stats['calls'] += 1
+            stats['seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            stats['rows'] += rows
+
+    def snapshot(self):
+        """
+        Returns a copy of the recorded metrics.
+
+        Returns:
+        - dict: {'stages': {name: {'calls', 'seconds', 'max_seconds', 'rows'}}, 'counters': {name: value}}
+        """
+        with self._lock:
+            return {
+                'stages': {name: dict(stats) for name, stats in self._stages.items()},
+                'counters': dict(self._counters)
+            }
+
+    def merge(self, snapshot):
+        """
+        Adds metrics recorded elsewhere, e.g. in a worker process, to this collector.
+
+        Parameters:
+        - snapshot (dict): A dictionary returned by snapshot().
+        """
+        with self._lock:
+            for name, other in snapshot['stages'].items():
+                stats = self._stages.setdefault(name, {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'rows': 0})
+                stats['calls'] += other['calls']
+                stats['seconds'] += other['seconds']
+                stats['max_seconds'] = max(stats['max_seconds'], other['max_seconds'])
+                stats['rows'] += other['rows']
+            for name, value in snapshot['counters'].items():
+                self._counters[name] = self._counters.get(name, 0) + value
+
+    def log_summary(self, title="Pipeline metrics"):
+        """
+        Writes one log line per stage and one for the counters.
+        """
+        if not self.enabled:
+            return
+        snapshot = self.snapshot()
+        for name, stats in sorted(snapshot['stages'].items()):
+            logging.info(f"{title}: {name} {stats['seconds']:.3f}s over {stats['calls']} calls "
+                         f"(max {stats['max_seconds']:.3f}s, {stats['rows']} rows)")
+        if snapshot['counters']:
+            counters = ", ".join(f"{name}={value}" for name, value in sorted(snapshot['counters'].items()))
+            logging.info(f"{title}: {counters}")
+
+    def write(self, file_path, **context):
+        """
+        Appends the recorded metrics to a JSON Lines file, one object per run.
+
+        Parameters:
+        - file_path (str): Path of the .jsonl file.
+        - context: Extra fields stored with the metrics, e.g. report='months_worked'.
+        """
+        if not self.enabled:
+            return
+        record = {'timestamp': datetime.now().isoformat(), **context, **self.snapshot()}
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(file_path, 'a') as file:
+            file.write(json.dumps(record, default=str) + "\n")
+
+
+metrics = PipelineMetrics()
+
+
+def timed(name):
+    """
+    Decorator that records each call of a function as a stage of the shared metrics collector.
+
+    When the function returns a DataFrame its length is recorded as the stage's rows.
+
+    Parameters:
+    - name (str): Stage name, e.g. 'compute.get_results'.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            with metrics.stage(name) as stage:
+                result = func(*args, **kwargs)
+                if isinstance(result, pd.DataFrame):
+                    stage.add_rows(len(result))
+                return result
+        return wrapper
+    return decorator
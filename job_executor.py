@@ -0,0 +1,174 @@
+import logging
+import queue
+import threading
+
+
+class JobCancelled(Exception):
+    """
+    Raised inside a running job once it has been cancelled.
+    """
+
+
+class Job:
+    """
+    A unit of background work submitted to a JobExecutor.
+
+    The job function receives the Job itself and calls report() between stages. report() raises
+    JobCancelled if the job was cancelled, so cancellation takes effect at the next stage boundary.
+
+    Attributes:
+    - name (str): A short description of the job, used in logs.
+    - stage (str): The last stage reported by the job.
+    """
+
+    def __init__(self, executor, name, func, on_progress=None, on_done=None, on_error=None):
+        self.name = name
+        self.stage = "queued"
+        self._executor = executor
+        self._func = func
+        self._on_progress = on_progress
+        self._on_done = on_done
+        self._on_error = on_error
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """
+        Requests cancellation. A queued job never starts; a running job stops at its next stage.
+        """
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        """
+        Raises JobCancelled if the job has been cancelled.
+        """
+        if self.cancelled:
+            raise JobCancelled(self.name)
+
+    def report(self, stage):
+        """
+        Reports a new progress stage to the UI thread.
+
+        Parameters:
+        - stage (str): Description of the stage the job is entering.
+        """
+        self.check_cancelled()
+        self.stage = stage
+        logging.info(f"Job '{self.name}': {stage}")
+        if self._on_progress is not None:
+            self._executor.dispatch(self._on_progress, stage)
+
+    def _run(self):
+        if self.cancelled:
+            logging.info(f"Job '{self.name}' cancelled before it started")
+            if self._on_error is not None:
+                self._executor.dispatch(self._on_error, JobCancelled(self.name))
+            return
+        try:
+            result = self._func(self)
+        except JobCancelled:
+            logging.info(f"Job '{self.name}' cancelled during '{self.stage}'")
+            if self._on_error is not None:
+                self._executor.dispatch(self._on_error, JobCancelled(self.name))
+        except Exception as e:
+            logging.error(f"Job '{self.name}' failed during '{self.stage}': {e}")
+            logging.debug("Detailed traceback:", exc_info=True)
+            if self._on_error is not None:
+                self._executor.dispatch(self._on_error, e)
+        else:
+            if self._on_done is not None:
+                self._executor.dispatch(self._on_done, result)
+
+
+class JobExecutor:
+    """
+    Runs jobs one at a time on a background worker thread.
+
+    Callbacks (progress, completion and errors) are never invoked on the worker thread. They are
+    queued and run by process_events(), which the UI thread calls periodically, e.g. from
+    root.after, because Tkinter widgets must only be touched from the main thread.
+    """
+
+    def __init__(self):
+        self._jobs = queue.Queue()
+        self._events = queue.Queue()
+        self._pending = []
+        self._lock = threading.Lock()
+        self._current = None
+        self._worker = threading.Thread(target=self._work, name="JobExecutor", daemon=True)
+        self._worker.start()
+
+    def dispatch(self, callback, *args):
+        """
+        Queues a callback to be run by the next process_events() call.
+        """
+        self._events.put((callback, args))
+
+    def process_events(self):
+        """
+        Runs all queued callbacks on the calling thread.
+        """
+        while True:
+            try:
+                callback, args = self._events.get_nowait()
+            except queue.Empty:
+                return
+            callback(*args)
+
+    def submit(self, name, func, on_progress=None, on_done=None, on_error=None):
+        """
+        Queues a job for execution.
+
+        Parameters:
+        - name (str): A short description of the job.
+        - func (callable): Called with the Job on the worker thread; its return value goes to on_done.
+        - on_progress (callable): Called with each reported stage.
+        - on_done (callable): Called with the job's result when it completes.
+        - on_error (callable): Called with the exception if the job fails or is cancelled.
+
+        Returns:
+        - Job: The submitted job, which can be cancelled.
+        """
+        job = Job(self, name, func, on_progress, on_done, on_error)
+        with self._lock:
+            self._pending.append(job)
+        self._jobs.put(job)
+        return job
+
+    def pending_count(self):
+        """
+        Returns the number of jobs waiting to start.
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def is_busy(self):
+        """
+        Returns True while a job is running or waiting to run.
+        """
+        with self._lock:
+            return self._current is not None or bool(self._pending)
+
+    def cancel_all(self):
+        """
+        Cancels the running job and every queued job.
+        """
+        with self._lock:
+            jobs = list(self._pending) + ([self._current] if self._current is not None else [])
+        for job in jobs:
+            job.cancel()
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            with self._lock:
+                self._pending.remove(job)
+                self._current = job
+            try:
+                job._run()
+            finally:
+                with self._lock:
+                    self._current = None
@@ -1,7 +1,83 @@
+import numpy as np
 import pandas as pd
 from dateutil.relativedelta import relativedelta
 from datetime import datetime
 
+from instrumentation import timed
+
+
+class StintIndex:
+    """
+    Groups roster rows (stints) by employee in one hash-based pass and merges each employee's
+    overlapping or adjacent stints into continuous periods of employment.
+    """
+
+    def __init__(self, names, start_month, end_month):
+        """
+        :param names: Series of employee names, one per roster row
+        :param start_month: Array of each row's first month worked (absolute month numbers)
+        :param end_month: Array of each row's last month worked; rows with start > end worked no months
+        """
+        self.person_codes, self.people = pd.factorize(names, use_na_sentinel=False)
+        self.stint_counts = np.bincount(self.person_codes, minlength=len(self.people))
+        self._positions = {person: position for position, person in enumerate(self.people)}
+        # Rows ordered by employee, so each employee's stints are one contiguous slice
+        self._rows_by_person = np.argsort(self.person_codes, kind='stable')
+        self._offsets = np.concatenate(([0], np.cumsum(self.stint_counts)))
+        self.start_month = np.asarray(start_month, dtype=float)
+        self.end_month = np.asarray(end_month, dtype=float)
+
+    def stints_of(self, name):
+        """
+        :return: Positional row numbers of all stints of an employee in roster order (empty if unknown)
+        """
+        position = self._positions.get(name)
+        if position is None:
+            return np.array([], dtype=np.int64)
+        return self._rows_by_person[self._offsets[position]:self._offsets[position + 1]]
+
+    def has_multiple_entries(self, name):
+        """
+        :return: True if the employee appears on more than one roster row
+        """
+        position = self._positions.get(name)
+        return position is not None and self.stint_counts[position] > 1
+
+    def multiple_entry_mask(self):
+        """
+        :return: Boolean array marking the rows of employees with more than one roster row
+        """
+        return self.stint_counts[self.person_codes] > 1
+
+    def merged_stints(self):
+        """
+        Merge each employee's stints that overlap or follow on in consecutive months.
+
+        Stints are sorted by (employee, first month); a new period starts whenever a stint begins
+        more than one month after the latest month covered so far by that employee.
+
+        :return: DataFrame with 'Name', 'First Month', 'Last Month' (absolute month numbers) and
+                 'Months Employed', one row per continuous period within the reporting window
+        """
+        worked = np.flatnonzero(self.start_month <= self.end_month)
+        order = worked[np.lexsort((self.start_month[worked], self.person_codes[worked]))]
+        stints = pd.DataFrame({
+            'person': self.person_codes[order],
+            'start': self.start_month[order],
+            'end': self.end_month[order]
+        })
+
+        covered_until = stints.groupby('person')['end'].cummax().groupby(stints['person']).shift()
+        new_period = covered_until.isna().to_numpy() | (stints['start'].to_numpy() > covered_until.to_numpy() + 1)
+        periods = stints.groupby(np.cumsum(new_period)).agg(person=('person', 'first'), start=('start', 'min'), end=('end', 'max'))
+
+        return pd.DataFrame({
+            'Name': self.people[periods['person'].to_numpy()],
+            'First Month': periods['start'].to_numpy(dtype=np.int64),
+            'Last Month': periods['end'].to_numpy(dtype=np.int64),
+            'Months Employed': (periods['end'] - periods['start'] + 1).to_numpy(dtype=np.int64)
+        })
+
 
 class MonthsWorked:
     def __init__(self, input_df, report_start_date, report_end_date):
@@ -17,6 +93,67 @@ class MonthsWorked:
         self.report_end_date = datetime.strptime(report_end_date, '%Y-%m-%d') if isinstance(report_end_date, str) else report_end_date
         self.df = self.input_df.copy()
 
+    ROLES_TO_TRACK = [
+        'Regional Director', 'Clinic Director', 'Lead Clinician', 'Clinician', 
+        'Prescriber', 'Front Desk/Receptionist', 'Intake', 'Case Management',
+        'Office Manager', 'Outreach', 'Marketing/Communications', 
+        'Data Manager', 'Intern', 'Fellow'
+    ]
+
+    # Column types for roster sheets, applied at ingest by SmartsheetFetcher.apply_schema
+    SCHEMA = {
+        'Cohen Clinic': 'category',
+        'Position': 'category',
+        'FTE': 'float32',
+        'Start Date': 'datetime64[ns]',
+        'End Date': 'datetime64[ns]',
+        'Employee Leave (start date)': 'datetime64[ns]',
+        'Employee Leave (end date)': 'datetime64[ns]'
+    }
+
+    @staticmethod
+    def widen_floats(series):
+        """
+        Return a float column as float64 values. Columns stored as float32 under SCHEMA (such as
+        'FTE') are rounded to 6 decimals, which drops the widening noise (0.8 -> 0.800000011920929)
+        while keeping every decimal an FTE is entered with. Use this wherever a typed frame's
+        floats leave pandas, e.g. in calculations, uploads and exports.
+
+        :param series: Float (or object) column
+        :return: float64 NumPy array
+        """
+        values = series.to_numpy(dtype=float)
+        if series.dtype == np.float32:
+            values = values.round(6)
+        return values
+
+    INPUT_COLUMNS = [
+        'Cohen Clinic',
+        'Name',
+        'Position',
+        'FTE',
+        'Start Date',
+        'End Date',
+        'Employee Leave (start date)',
+        'Employee Leave (end date)'
+    ]
+
+    @classmethod
+    def from_chunks(cls, chunks, report_start_date, report_end_date):
+        """
+        Build a calculator from an iterable of DataFrame chunks, such as the pages yielded by
+        SmartsheetFetcher.iter_smartsheet_data. Only the columns used by the calculation are kept
+        from each chunk, so unused sheet columns are never held for the whole roster.
+
+        :param chunks: Iterable of DataFrames sharing the roster's columns
+        :param report_start_date: Start date of the reporting period (datetime object)
+        :param report_end_date: End date of the reporting period (datetime object)
+        :return: MonthsWorked instance over the combined roster
+        """
+        frames = [chunk.reindex(columns=cls.INPUT_COLUMNS) for chunk in chunks]
+        input_df = pd.concat(frames) if frames else pd.DataFrame(columns=cls.INPUT_COLUMNS)
+        return cls(input_df, report_start_date, report_end_date)
+
     def validate_input_dataframe(self, df):
         """
         Validate the input DataFrame for required columns, datatypes, and values.
@@ -124,46 +261,200 @@ class MonthsWorked:
 
         return total_months, fte_adjusted_months, months_list
 
+    @staticmethod
+    def _parse_dates(series):
+        """
+        Parse a column of 'YYYY-MM-DD' strings (or datetimes) into a DatetimeIndex.
+        Missing values become NaT.
+        """
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return pd.DatetimeIndex(series)
+        return pd.DatetimeIndex(pd.to_datetime(series, format='%Y-%m-%d'))
+
+    @staticmethod
+    def _month_index(dates):
+        """
+        Convert dates to an absolute month number (year * 12 + month - 1). NaT becomes NaN.
+        Accepts a DatetimeIndex, a scalar or a datetime64 array of any shape.
+        """
+        months = np.asarray(dates, dtype='datetime64[M]')
+        return np.where(np.isnat(months), np.nan, months.astype(np.int64) + 1970 * 12)
+
+    @classmethod
+    def _fte_values(cls, df):
+        """
+        Return FTE as a float64 array with missing values treated as 1.
+        """
+        return cls.widen_floats(df['FTE'].where(df['FTE'].notna(), 1))
+
+    @classmethod
+    def _clamped_month_bounds(cls, start, end, leave_start, leave_end, report_start, report_end):
+        """
+        Compute the first and last month worked (as absolute month numbers) for each row, clamped
+        to the reporting period with the same rules as calculate_months_in_period.
+
+        The report bounds broadcast against the rows, so a single window is passed as scalars and
+        many windows as (windows x 1) datetime64 arrays, giving (windows x rows) results.
+
+        :param start: DatetimeIndex of start dates
+        :param end: DatetimeIndex of end dates
+        :param leave_start: DatetimeIndex of leave start dates
+        :param leave_end: DatetimeIndex of leave end dates
+        :param report_start: First day of the report period(s)
+        :param report_end: Last day of the report period(s)
+        :return: Tuple of (start month, end month) float arrays; a row worked no months when start > end
+        """
+        report_start = np.asarray(report_start, dtype='datetime64[ns]')
+        report_end = np.asarray(report_end, dtype='datetime64[ns]')
+
+        # First month worked: clamp to the report start, otherwise count the start month
+        # only when the employee started before the 16th
+        start_month = cls._month_index(start)
+        start_month = np.where(
+            start.to_numpy() < report_start,
+            cls._month_index(report_start),
+            np.where(np.asarray(start.day < 16), start_month, start_month + 1)
+        )
+
+        # Last month worked
+        report_last_month = cls._month_index(report_end - np.timedelta64(1, 'D'))
+        end_month_raw = cls._month_index(end)
+        end_missing = np.asarray(end.isna())
+        open_leave = np.asarray(leave_start.notna() & leave_end.isna())
+        end_month = np.select(
+            [
+                end_missing & open_leave,
+                end_missing,
+                end.to_numpy() >= report_end,
+                np.asarray(end.day >= 15),
+            ],
+            [
+                cls._month_index(leave_start - pd.Timedelta(days=1)),
+                report_last_month,
+                report_last_month,
+                end_month_raw - 1,
+            ],
+            default=end_month_raw - 2
+        )
+
+        return start_month, end_month
+
+    @staticmethod
+    def _leave_months(leave_start, leave_end, report_start, report_end):
+        """
+        Months of leave to deduct for each row: days of leave inside the reporting period, with the
+        leave window clamped to the period, divided by 22 working days. Report bounds broadcast as
+        in _clamped_month_bounds.
+
+        :param leave_start: DatetimeIndex of leave start dates
+        :param leave_end: DatetimeIndex of leave end dates
+        :param report_start: First day of the report period(s)
+        :param report_end: Last day of the report period(s)
+        :return: Float array of leave months; 0 where a row has no leave in the period
+        """
+        report_start = np.asarray(report_start, dtype='datetime64[ns]')
+        report_end = np.asarray(report_end, dtype='datetime64[ns]')
+        leave_start_values = leave_start.to_numpy()
+        leave_end_values = leave_end.to_numpy()
+
+        has_leave = (
+            np.asarray(leave_start.notna() & leave_end.notna())
+            & ~((leave_end_values < report_start) | (leave_start_values > report_end))
+        )
+        leave_span = np.minimum(leave_end_values, report_end) - np.maximum(leave_start_values, report_start)
+        leave_days = np.where(has_leave, np.floor(leave_span / np.timedelta64(1, 'D')), 0)
+        return leave_days // 22
+
+    def calculate_months_columnar(self, df):
+        """
+        Vectorized equivalent of calculate_months_in_period for a whole DataFrame.
+
+        Applies the same clamping rules as the per-row function (with include_start_month
+        and skip_first_partial_month both False, as used by get_results) using datetime64
+        month arithmetic instead of a Python loop.
+
+        :param df: DataFrame with 'Start Date', 'End Date', 'FTE', 'Employee Leave (start date)'
+                   and 'Employee Leave (end date)' columns
+        :return: Tuple of (months worked, FTE-adjusted months) NumPy arrays aligned with df
+        """
+        start = self._parse_dates(df['Start Date'])
+        end = self._parse_dates(df['End Date'])
+        leave_start = self._parse_dates(df['Employee Leave (start date)'])
+        leave_end = self._parse_dates(df['Employee Leave (end date)'])
+        fte = self._fte_values(df)
+
+        start_month, end_month = self._clamped_month_bounds(
+            start, end, leave_start, leave_end, self.report_start_date, self.report_end_date
+        )
+
+        months_worked = end_month - start_month + 1
+        active = months_worked > 0
+        leave_months = self._leave_months(leave_start, leave_end, self.report_start_date, self.report_end_date)
+
+        total_months = np.where(active, np.maximum(0, months_worked - leave_months), 0).astype(np.int64)
+        fte_adjusted_months = total_months * fte
+
+        return total_months, fte_adjusted_months
+
+    def build_stint_index(self):
+        """
+        Index the roster's stints by employee, with each row's first and last month clamped to the
+        reporting period as in get_results.
+
+        :return: StintIndex over self.df
+        """
+        start = self._parse_dates(self.df['Start Date'])
+        end = self._parse_dates(self.df['End Date'])
+        leave_start = self._parse_dates(self.df['Employee Leave (start date)'])
+        leave_end = self._parse_dates(self.df['Employee Leave (end date)'])
+        start_month, end_month = self._clamped_month_bounds(
+            start, end, leave_start, leave_end, self.report_start_date, self.report_end_date
+        )
+        return StintIndex(self.df['Name'], start_month, end_month)
+
+    def get_person_results(self, results_df=None, stint_index=None):
+        """
+        Roll the per-row results up to one row per employee.
+
+        Overlapping or back-to-back stints of returning staff are merged, so 'Months Employed'
+        counts each calendar month once per person, while 'Months Worked' and
+        'FTE-Adjusted Months Worked' sum the per-row values (after leave deductions).
+
+        :param results_df: Output of get_results; computed if not given
+        :param stint_index: StintIndex from build_stint_index; built if not given
+        :return: DataFrame with 'Name', 'Stints', 'Periods', 'Months Employed', 'Months Worked'
+                 and 'FTE-Adjusted Months Worked', one row per employee
+        """
+        if results_df is None:
+            results_df = self.get_results()
+        if stint_index is None:
+            stint_index = self.build_stint_index()
+
+        codes = stint_index.person_codes
+        people = len(stint_index.people)
+        periods = stint_index.merged_stints()
+        period_codes = pd.Index(stint_index.people).get_indexer(periods['Name'])
+
+        return pd.DataFrame({
+            'Name': stint_index.people,
+            'Stints': stint_index.stint_counts,
+            'Periods': np.bincount(period_codes, minlength=people),
+            'Months Employed': np.bincount(period_codes, weights=periods['Months Employed'], minlength=people).astype(np.int64),
+            'Months Worked': np.bincount(codes, weights=results_df['Months Worked'].to_numpy(dtype=float), minlength=people).astype(np.int64),
+            'FTE-Adjusted Months Worked': np.bincount(codes, weights=results_df['FTE-Adjusted Months Worked'].to_numpy(dtype=float), minlength=people)
+        })
+
+    @timed('compute.get_results')
     def get_results(self):
         """
         Process the input DataFrame and return the resulting DataFrame with calculated months worked and FTE-adjusted months.
         
         :return: DataFrame with the results
         """
-        months_worked_list = []
-        fte_adjusted_months_list = []
-        months_printed_list = []
-
-        multiple_entry_names = self.df[self.df.duplicated(['Name'], keep=False)]['Name'].unique()
-
-        for _, row in self.df.iterrows():
-            start_date = row['Start Date']
-            end_date = row['End Date'] if pd.notna(row['End Date']) else None
-            fte = row['FTE'] if pd.notna(row['FTE']) else 1
-            role = row['Position']
-            name = row['Name']
-            leave_start = row['Employee Leave (start date)']
-            leave_end = row['Employee Leave (end date)']
-
-            multiple_entries = name in multiple_entry_names
-            include_start_month = False
-            skip_first_partial_month = False
-
-            if multiple_entries:
-                months_worked, fte_adjusted_months, months_list = self.calculate_months_in_period(
-                    start_date, end_date, fte, role, name, leave_start, leave_end, include_start_month, skip_first_partial_month
-                )
-            else:
-                months_worked, fte_adjusted_months, months_list = self.calculate_months_in_period(
-                    start_date, end_date, fte, role, name, leave_start, leave_end, include_start_month, skip_first_partial_month
-                )
-
-            months_worked_list.append(months_worked)
-            fte_adjusted_months_list.append(fte_adjusted_months)
-            months_printed_list.append(months_list)
+        months_worked, fte_adjusted_months = self.calculate_months_columnar(self.df)
 
-        self.df['Months Worked'] = months_worked_list
-        self.df['FTE-Adjusted Months Worked'] = fte_adjusted_months_list
+        self.df['Months Worked'] = months_worked
+        self.df['FTE-Adjusted Months Worked'] = fte_adjusted_months
 
         selected_columns = [
             'Cohen Clinic',
@@ -179,6 +470,62 @@ class MonthsWorked:
         ]
         return self.df[selected_columns]
     
+    def get_monthly_occupancy(self, weighted=True):
+        """
+        Build an employee x month occupancy matrix for the reporting period in one vectorized pass.
+
+        Cell (i, j) marks whether row i worked month j, using the same clamped first and last months
+        as get_results (the months listed by calculate_months_in_period). Leave is deducted from
+        totals as a month count rather than from specific months, so it is not reflected here.
+
+        :param weighted: If True, cells hold the row's FTE as float32; otherwise they are booleans
+        :return: DataFrame indexed like the input roster with one 'YYYY-MM' column per report month
+        """
+        start = self._parse_dates(self.df['Start Date'])
+        end = self._parse_dates(self.df['End Date'])
+        leave_start = self._parse_dates(self.df['Employee Leave (start date)'])
+        leave_end = self._parse_dates(self.df['Employee Leave (end date)'])
+        start_month, end_month = self._clamped_month_bounds(
+            start, end, leave_start, leave_end, self.report_start_date, self.report_end_date
+        )
+
+        report_start = pd.Timestamp(self.report_start_date)
+        report_last_day = pd.Timestamp(self.report_end_date) - pd.Timedelta(days=1)
+        months = pd.period_range(report_start.to_period('M'), report_last_day.to_period('M'), freq='M')
+        month_numbers = np.asarray(months.year * 12 + months.month - 1, dtype=float)
+
+        # Broadcast each row's [start, end] month range against the report months; NaN bounds compare False
+        occupancy = (start_month[:, None] <= month_numbers[None, :]) & (month_numbers[None, :] <= end_month[:, None])
+
+        if weighted:
+            fte = self.df['FTE'].where(self.df['FTE'].notna(), 1).to_numpy(dtype=np.float32)
+            occupancy = occupancy * fte[:, None]
+
+        return pd.DataFrame(occupancy, index=self.df.index, columns=months.strftime('%Y-%m'))
+
+    def get_monthly_staffing(self, by='Position', weighted=True):
+        """
+        Staffing per month, optionally broken down by a column such as 'Position' or 'Cohen Clinic'.
+
+        Computed by adding each row of the occupancy matrix into its group's row, which takes
+        O(rows x months) time and memory however many groups there are.
+
+        :param by: Column to group rows by, or None for a single total per month
+        :param weighted: If True, sum FTE; otherwise count people
+        :return: DataFrame with one row per month and one column per group (or a 'Total' column)
+        """
+        occupancy = self.get_monthly_occupancy(weighted=weighted)
+        values = occupancy.to_numpy(dtype=np.float32)
+
+        if by is None:
+            return pd.DataFrame({'Total': values.sum(axis=0)}, index=occupancy.columns)
+
+        codes, groups = pd.factorize(self.df[by], use_na_sentinel=False)
+        totals = np.zeros((len(groups), values.shape[1]), dtype=np.float32)
+        np.add.at(totals, codes, values)
+        return pd.DataFrame(totals.T, index=occupancy.columns, columns=groups)
+
+    @timed('compute.add_headcount_column')
     def add_headcount_column(self, df):
         """
         Adds a 'Headcount' column to the DataFrame. The headcount value
@@ -201,6 +548,7 @@ class MonthsWorked:
             print(f"An error occurred while adding the headcount column: {e}")
             return None
     
+    @timed('compute.generate_summary')
     def generate_summary(self, input_dataframe, grant_year=12):
         """
         Generate a staffing summary from the input DataFrame and append the new summary columns back to it.
@@ -212,12 +560,6 @@ class MonthsWorked:
         - pd.DataFrame: The original DataFrame with appended summary columns.
         """
         df = input_dataframe.copy()
-        roles_to_track = [
-            'Regional Director', 'Clinic Director', 'Lead Clinician', 'Clinician', 
-            'Prescriber', 'Front Desk/Receptionist', 'Intake', 'Case Management',
-            'Office Manager', 'Outreach', 'Marketing/Communications', 
-            'Data Manager', 'Intern', 'Fellow'
-        ]
         try:
             # Validate input DataFrame
             self.validate_input_dataframe(df)
@@ -230,22 +572,17 @@ class MonthsWorked:
                 'Total Staff': df['FTE-Adjusted Months Worked'].sum() / grant_year
             }
 
-            # Role-specific headcounts for the entire grant year
-            for role in roles_to_track:
-                summary[f"# of {role}s"] = (
-                    df.loc[df['Position'] == role, 'FTE-Adjusted Months Worked'].sum() / grant_year
-                )
+            # Role-specific headcounts for the entire grant year, from a single pass over Position;
+            # roles not present default to 0
+            role_totals = df.groupby('Position', observed=True)['FTE-Adjusted Months Worked'].sum()
+            for role in self.ROLES_TO_TRACK:
+                summary[f"# of {role}s"] = role_totals[role] / grant_year if role in role_totals.index else 0
 
             summary['Leads + Clinicians'] = (
                 summary.get("# of Lead Clinicians", 0) +
                 summary.get("# of Clinicians", 0)
             )
 
-            # Ensure roles default to 0 if not present
-            for role in roles_to_track:
-                if role not in df['Position'].unique():
-                    summary[f"# of {role}s"] = 0
-
             # Handle missing End Date
             summary['Currently Working Count'] = df['End Date'].isna().sum()
 
@@ -267,3 +604,168 @@ class MonthsWorked:
 
         except Exception as e:
             raise RuntimeError(f"Unexpected error occurred: {e}")
+
+    def generate_clinic_summaries(self, input_dataframe, grant_year=12, include_network=True):
+        """
+        Generate staffing summaries for a roster covering any number of clinics.
+
+        All per-clinic, per-role totals come from one groupby over (clinic, position), so the
+        roster is scanned once regardless of the number of clinics or tracked roles.
+
+        Args:
+        - input_dataframe (pd.DataFrame): DataFrame containing pre-calculated staffing data, e.g. from get_results.
+        - grant_year (int): Number of months in the grant period.
+        - include_network (bool): Whether to append a 'Network' row with totals across all clinics.
+
+        Returns:
+        - pd.DataFrame: A tidy summary table with one row per clinic and the same summary columns
+          as generate_summary.
+        """
+        df = input_dataframe
+        try:
+            self.validate_input_dataframe(df)
+        except ValueError as ve:
+            raise RuntimeError(f"Validation error: {ve}")
+
+        if 'Cohen Clinic' in df.columns:
+            clinics = df['Cohen Clinic'].astype(object).fillna('Unknown Clinic')
+        else:
+            clinics = pd.Series('Unknown Clinic', index=df.index)
+        clinics = clinics.rename('Cohen Clinic')
+
+        fte_months = df['FTE-Adjusted Months Worked'].astype(float)
+        by_position = fte_months.groupby([clinics, df['Position']], observed=True).sum().unstack(fill_value=0.0)
+
+        summary = pd.DataFrame(index=by_position.index)
+        summary['Total Staff'] = by_position.sum(axis=1) / grant_year
+        for role in self.ROLES_TO_TRACK:
+            summary[f"# of {role}s"] = (by_position[role] if role in by_position.columns else 0.0) / grant_year
+        summary['Leads + Clinicians'] = summary["# of Lead Clinicians"] + summary["# of Clinicians"]
+        summary['Currently Working Count'] = df['End Date'].isna().groupby(clinics, observed=True).sum()
+
+        if include_network:
+            summary.loc['Network'] = summary.sum()
+
+        summary['Currently Working Count'] = summary['Currently Working Count'].astype(int)
+        return summary.reset_index()
+
+    @staticmethod
+    def quarter_windows(start_date, end_date):
+        """
+        Calendar-quarter report windows covering a period, e.g. for quarterly finance reports.
+
+        :param start_date: First day of the period (datetime or 'YYYY-MM-DD')
+        :param end_date: Last day of the period (datetime or 'YYYY-MM-DD')
+        :return: Dictionary mapping 'YYYYQn' to (first day, last day) of each quarter in the period
+        """
+        quarters = pd.period_range(pd.Timestamp(start_date).to_period('Q'), pd.Timestamp(end_date).to_period('Q'), freq='Q')
+        return {str(quarter): (quarter.start_time.to_pydatetime(), quarter.end_time.normalize().to_pydatetime()) for quarter in quarters}
+
+    @classmethod
+    def evaluate_windows(cls, input_df, windows, grant_months=None):
+        """
+        Evaluate a roster over many report windows at once and return a window x clinic x role cube.
+
+        Every row's clamped months, leave deduction and FTE-adjusted months are computed for all
+        windows in one broadcast over a (windows x rows) grid, with the same rules as get_results,
+        and aggregated per (window, clinic, role) in a single bincount. Each window gives the same
+        figures as MonthsWorked(input_df, start, end) followed by generate_clinic_summaries.
+
+        :param input_df: Roster DataFrame with the INPUT_COLUMNS
+        :param windows: Dictionary of label -> (start, end), or a list of (start, end) tuples labelled
+                        'start to end'; dates as datetimes or 'YYYY-MM-DD' strings
+        :param grant_months: Divisor for the 'Staff' figure; defaults to the whole months between each
+                             window's start and end, as passed to generate_summary by the app
+        :return: DataFrame indexed by ('Window', 'Cohen Clinic', 'Position') with 'Months Worked',
+                 'FTE-Adjusted Months Worked', 'Staff' and 'Currently Working Count' columns
+        """
+        if not isinstance(windows, dict):
+            windows = {f"{pd.Timestamp(start):%Y-%m-%d} to {pd.Timestamp(end):%Y-%m-%d}": (start, end) for start, end in windows}
+        labels = list(windows)
+        window_starts = pd.DatetimeIndex([pd.Timestamp(start) for start, _ in windows.values()])
+        window_ends = pd.DatetimeIndex([pd.Timestamp(end) for _, end in windows.values()])
+
+        start = cls._parse_dates(input_df['Start Date'])
+        end = cls._parse_dates(input_df['End Date'])
+        leave_start = cls._parse_dates(input_df['Employee Leave (start date)'])
+        leave_end = cls._parse_dates(input_df['Employee Leave (end date)'])
+        fte = cls._fte_values(input_df)
+
+        # Windows run down the first axis and roster rows along the second
+        report_start = window_starts.to_numpy()[:, None]
+        report_end = window_ends.to_numpy()[:, None]
+        start_month, end_month = cls._clamped_month_bounds(start, end, leave_start, leave_end, report_start, report_end)
+
+        months_worked = end_month - start_month + 1
+        active = months_worked > 0
+        leave_months = cls._leave_months(leave_start, leave_end, report_start, report_end)
+
+        total_months = np.where(active, np.maximum(0, months_worked - leave_months), 0)
+        fte_adjusted_months = total_months * fte[None, :]
+
+        # Aggregate every (window, clinic, role) cell in one bincount over flattened indices
+        if 'Cohen Clinic' in input_df.columns:
+            clinics = input_df['Cohen Clinic'].astype(object).fillna('Unknown Clinic')
+        else:
+            clinics = pd.Series('Unknown Clinic', index=input_df.index)
+        grouped = pd.DataFrame({'Cohen Clinic': clinics, 'Position': input_df['Position']}).groupby(
+            ['Cohen Clinic', 'Position'], observed=True
+        )
+        group_codes = grouped.ngroup().to_numpy()
+        groups = grouped.size().index
+        in_group = group_codes >= 0
+        n_groups = len(groups)
+
+        flat_codes = (np.arange(len(labels))[:, None] * n_groups + group_codes[None, :])[:, in_group].ravel()
+
+        def cube_sum(values):
+            sums = np.bincount(flat_codes, weights=values[:, in_group].ravel(), minlength=len(labels) * n_groups)
+            return sums.reshape(len(labels), n_groups)
+
+        if grant_months is None:
+            grant_months = np.maximum(
+                (window_ends.year - window_starts.year) * 12 + window_ends.month - window_starts.month, 1
+            ).to_numpy(dtype=float)[:, None]
+
+        fte_totals = cube_sum(fte_adjusted_months)
+        currently_working = np.bincount(group_codes[in_group], weights=np.asarray(end.isna())[in_group], minlength=n_groups)
+
+        index = pd.MultiIndex.from_tuples(
+            [(label, clinic, position) for label in labels for clinic, position in groups],
+            names=['Window', 'Cohen Clinic', 'Position']
+        )
+        return pd.DataFrame({
+            'Months Worked': cube_sum(total_months).ravel().astype(np.int64),
+            'FTE-Adjusted Months Worked': fte_totals.ravel(),
+            'Staff': (fte_totals / grant_months).ravel(),
+            'Currently Working Count': np.tile(currently_working, len(labels)).astype(np.int64)
+        }, index=index)
+
+    @classmethod
+    def summarize_windows(cls, cube, include_network=True):
+        """
+        Reshape a cube from evaluate_windows into one generate_clinic_summaries table per window.
+
+        :param cube: Output of evaluate_windows
+        :param include_network: Whether to add a 'Network' row per window with totals across clinics
+        :return: DataFrame with 'Window', 'Cohen Clinic' and the generate_summary columns
+        """
+        by_position = cube['Staff'].unstack('Position', fill_value=0.0)
+        summary = pd.DataFrame(index=by_position.index)
+        summary['Total Staff'] = by_position.sum(axis=1)
+        for role in cls.ROLES_TO_TRACK:
+            summary[f"# of {role}s"] = by_position[role] if role in by_position.columns else 0.0
+        summary['Leads + Clinicians'] = summary["# of Lead Clinicians"] + summary["# of Clinicians"]
+        summary['Currently Working Count'] = cube['Currently Working Count'].groupby(['Window', 'Cohen Clinic'], sort=False).sum()
+
+        if include_network:
+            network = summary.groupby(level='Window', sort=False).sum()
+            network.index = pd.MultiIndex.from_arrays([network.index, ['Network'] * len(network)], names=summary.index.names)
+            summary = pd.concat([summary, network])
+
+        # Keep windows in the order they were given, with each window's clinics in their existing order
+        window_order = cube.index.get_level_values('Window').unique().get_indexer(summary.index.get_level_values('Window'))
+        summary = summary.iloc[np.argsort(window_order, kind='stable')]
+
+        summary['Currently Working Count'] = summary['Currently Working Count'].astype(int)
+        return summary.reset_index()
@@ -0,0 +1,252 @@
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+
+class ReportHistoryStore:
+    """
+    A local columnar history of report runs, stored as a Hive-partitioned Parquet dataset.
+
+    Each run appends its inputs, per-row results and summary as separate tables under
+    <history_dir>/<table>/report_type=<type>/clinic=<clinic>/run_date=<YYYY-MM-DD>/<run_id>.parquet.
+    Queries prune partitions by report type, clinic and run date before touching any file, read
+    only the requested columns and memory-map the files, so trends over thousands of runs can be
+    pulled without loading the whole history.
+
+    Every stored row carries 'run_id' and 'run_timestamp' columns, plus 'grant_start_date' and
+    'grant_end_date' when given. The partition keys come back as 'report_type', 'clinic' and
+    'run_date' columns.
+    """
+
+    TABLES = ('inputs', 'results', 'summary')
+
+    def __init__(self, history_dir):
+        """
+        Parameters:
+        - history_dir (str): Root directory of the dataset; created if it does not exist.
+        """
+        self.history_dir = history_dir
+        self._lock = threading.Lock()
+        os.makedirs(history_dir, exist_ok=True)
+
+    @staticmethod
+    def _partition_dir(key, value):
+        return f"{key}={quote(str(value), safe=' ')}"
+
+    @staticmethod
+    def _to_arrow(df):
+        """
+        Converts a DataFrame to an Arrow table with stable column types across runs: categoricals
+        and text become strings, object columns holding only numbers become floats.
+        """
+        df = df.reset_index(drop=True)
+        columns = {}
+        for col in df.columns:
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype) or series.dtype == object:
+                values = series.astype(object).where(series.notna(), None)
+                numeric = pd.to_numeric(values, errors='coerce')
+                if values.notna().any() and numeric.notna().sum() == values.notna().sum() and not values.map(lambda v: isinstance(v, str)).any():
+                    columns[str(col)] = pa.array(numeric.to_numpy(dtype=float), type=pa.float64(), from_pandas=True)
+                else:
+                    columns[str(col)] = pa.array([None if v is None else str(v) for v in values], type=pa.string())
+            else:
+                columns[str(col)] = pa.array(series, from_pandas=True)
+        return pa.table(columns)
+
+    def _write(self, table, report_type, clinic, run_date, run_id, df):
+        directory = os.path.join(
+            self.history_dir, table, self._partition_dir('report_type', report_type),
+            self._partition_dir('clinic', clinic), self._partition_dir('run_date', run_date)
+        )
+        os.makedirs(directory, exist_ok=True)
+        file_path = os.path.join(directory, f"{run_id}.parquet")
+        temp_path = os.path.join(directory, f".{run_id}.parquet.tmp")  # Dot files are ignored by dataset discovery
+        pq.write_table(self._to_arrow(df), temp_path)
+        os.replace(temp_path, file_path)
+
+    def append(self, report_type, results_df, inputs_df=None, summary_df=None, clinic=None,
+               grant_start_date=None, grant_end_date=None, run_time=None):
+        """
+        Appends one report run to the history.
+
+        Rows are split into clinic partitions by their 'Cohen Clinic' column when present, so a
+        roster covering several clinics is filed under each of them; otherwise everything is filed
+        under `clinic`.
+
+        Parameters:
+        - report_type (str): e.g. 'months_worked' or 'clinic_turnover'.
+        - results_df (pd.DataFrame): The run's per-row results.
+        - inputs_df (pd.DataFrame): The sheet data the run was computed from.
+        - summary_df (pd.DataFrame): One row of summary figures per clinic.
+        - clinic (str): Clinic partition for rows without a 'Cohen Clinic' value, e.g. a clinic code.
+        - grant_start_date (datetime): Start of the reporting period, stored with every row.
+        - grant_end_date (datetime): End of the reporting period, stored with every row.
+        - run_time (datetime): When the report was run. Defaults to now.
+
+        Returns:
+        - str: The run ID.
+        """
+        run_time = run_time or datetime.now()
+        run_id = f"{run_time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        run_date = run_time.strftime('%Y-%m-%d')
+        default_clinic = clinic if clinic is not None else 'Unknown Clinic'
+
+        with self._lock:
+            for table, df in (('inputs', inputs_df), ('results', results_df), ('summary', summary_df)):
+                if df is None or df.empty:
+                    continue
+                df = df.assign(run_id=run_id, run_timestamp=pd.Timestamp(run_time))
+                if grant_start_date is not None:
+                    df = df.assign(grant_start_date=pd.Timestamp(grant_start_date), grant_end_date=pd.Timestamp(grant_end_date))
+
+                if 'Cohen Clinic' in df.columns:
+                    clinics = df['Cohen Clinic'].astype(object).fillna(default_clinic)
+                    for clinic_name, clinic_df in df.groupby(clinics.to_numpy(), sort=False):
+                        self._write(table, report_type, clinic_name, run_date, run_id, clinic_df)
+                else:
+                    self._write(table, report_type, default_clinic, run_date, run_id, df)
+
+        logging.info(f"Recorded {report_type} run {run_id} in report history")
+        return run_id
+
+    def _dataset(self, table):
+        path = os.path.join(self.history_dir, table)
+        if not os.path.isdir(path):
+            return None
+        return ds.dataset(path, format='parquet', partitioning=ds.HivePartitioning.discover(infer_dictionary=False, segment_encoding='uri'))
+
+    @staticmethod
+    def _filter(report_type=None, clinics=None, since=None, until=None):
+        expression = None
+        conditions = []
+        if report_type is not None:
+            conditions.append(ds.field('report_type') == report_type)
+        if clinics is not None:
+            conditions.append(ds.field('clinic').isin([clinics] if isinstance(clinics, str) else list(clinics)))
+        if since is not None:
+            conditions.append(ds.field('run_date') >= pd.Timestamp(since).strftime('%Y-%m-%d'))
+        if until is not None:
+            conditions.append(ds.field('run_date') <= pd.Timestamp(until).strftime('%Y-%m-%d'))
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def query(self, table='summary', report_type=None, clinics=None, since=None, until=None, columns=None, last_runs=None):
+        """
+        Reads stored rows, pruning partitions before any file is opened.
+
+        Parameters:
+        - table (str): 'inputs', 'results' or 'summary'.
+        - report_type (str): Only runs of this report type.
+        - clinics (str or list): Only these clinics.
+        - since (datetime or str): Only runs on or after this date.
+        - until (datetime or str): Only runs on or before this date.
+        - columns (list): Columns to read; partition keys, 'run_id' and 'run_timestamp' are always included.
+        - last_runs (int): Only the most recent N runs per clinic.
+
+        Returns:
+        - pd.DataFrame: Matching rows ordered by run time.
+        """
+        if table not in self.TABLES:
+            raise ValueError(f"Unknown history table: {table}")
+        dataset = self._dataset(table)
+        if dataset is None:
+            return pd.DataFrame()
+
+        fragments = list(dataset.get_fragments(filter=self._filter(report_type, clinics, since, until)))
+        if not fragments:
+            return pd.DataFrame()
+
+        if last_runs is not None:
+            fragments = self._latest_fragments(fragments, last_runs)
+
+        df = self._read_fragments(fragments, columns).to_pandas()
+        return df.sort_values('run_timestamp', kind='stable').reset_index(drop=True)
+
+    @staticmethod
+    def _latest_fragments(fragments, last_runs):
+        """
+        Keeps the fragments of the most recent `last_runs` runs per clinic, using only file paths.
+        """
+        by_clinic = {}
+        for fragment in fragments:
+            keys = ds.get_partition_keys(fragment.partition_expression)
+            by_clinic.setdefault(keys.get('clinic'), []).append(fragment)
+        latest = []
+        for clinic_fragments in by_clinic.values():
+            # Run IDs start with the run timestamp, so file names sort chronologically
+            clinic_fragments.sort(key=lambda fragment: os.path.basename(fragment.path))
+            latest.extend(clinic_fragments[-last_runs:])
+        return latest
+
+    @staticmethod
+    def _read_fragments(fragments, columns):
+        """
+        Reads fragments through memory-mapped files, projecting to the requested columns and
+        attaching each file's partition keys. Columns whose types differ between runs (e.g. an
+        all-empty column) are promoted to a common type.
+        """
+        partition_keys = ['report_type', 'clinic', 'run_date']
+        wanted = None if columns is None else list(dict.fromkeys(['run_id', 'run_timestamp'] + list(columns)))
+
+        tables = []
+        for fragment in fragments:
+            keys = ds.get_partition_keys(fragment.partition_expression)
+            file_columns = None
+            if wanted is not None:
+                names = pq.read_schema(fragment.path, memory_map=True).names
+                file_columns = [col for col in wanted if col in names]
+            file_table = pq.read_table(fragment.path, columns=file_columns, memory_map=True)
+            for name in reversed(partition_keys):
+                file_table = file_table.add_column(0, name, pa.array([keys.get(name)] * file_table.num_rows, type=pa.string()))
+            tables.append(file_table)
+        return pa.concat_tables(tables, promote_options='permissive')
+
+    def runs(self, report_type=None, clinics=None):
+        """
+        Lists stored runs from the partition directories and file names only.
+
+        Returns:
+        - pd.DataFrame: One row per (run, clinic) with 'report_type', 'clinic', 'run_date' and 'run_id'.
+        """
+        dataset = self._dataset('results')
+        if dataset is None:
+            return pd.DataFrame(columns=['report_type', 'clinic', 'run_date', 'run_id'])
+        records = []
+        for fragment in dataset.get_fragments(filter=self._filter(report_type, clinics)):
+            keys = ds.get_partition_keys(fragment.partition_expression)
+            records.append({
+                'report_type': keys.get('report_type'),
+                'clinic': keys.get('clinic'),
+                'run_date': keys.get('run_date'),
+                'run_id': os.path.splitext(os.path.basename(fragment.path))[0]
+            })
+        return pd.DataFrame(records, columns=['report_type', 'clinic', 'run_date', 'run_id']).sort_values('run_id', kind='stable').reset_index(drop=True)
+
+    def trend(self, metric, report_type='months_worked', clinics=None, last_runs=8):
+        """
+        A summary metric per run and clinic, e.g. how a clinic's 'Total Staff' changed over its
+        last 8 runs.
+
+        Parameters:
+        - metric (str): A summary column, e.g. 'Total Staff' or '# of Clinicians'.
+        - report_type (str): Report type of the runs.
+        - clinics (str or list): Clinics to include; all by default.
+        - last_runs (int): Number of most recent runs per clinic.
+
+        Returns:
+        - pd.DataFrame: Indexed by run timestamp, one column per clinic.
+        """
+        df = self.query('summary', report_type=report_type, clinics=clinics, columns=[metric], last_runs=last_runs)
+        if df.empty:
+            return pd.DataFrame()
+        return df.pivot_table(index='run_timestamp', columns='clinic', values=metric, aggfunc='first')
@@ -0,0 +1,112 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+from instrumentation import metrics
+from months_worked import MonthsWorked
+
+
+def cell_values(series):
+    """
+    Converts a DataFrame column to a list of values openpyxl can write, with blanks for NaN, NaT
+    and Infinity. SmartsheetFetcher builds its upload cells from the same values.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.astype(object).where(series.notna(), None).tolist()
+    if pd.api.types.is_float_dtype(series):
+        values = MonthsWorked.widen_floats(series)
+        finite = np.isfinite(values)
+        return [value if ok else None for value, ok in zip(values.tolist(), finite.tolist())]
+    values = series.astype(object)
+    return values.where(values.notna(), None).tolist()
+
+
+def write_excel_streaming(df, file_path, chunk_size=10000):
+    """
+    Writes a DataFrame to an xlsx file without building the workbook in memory.
+
+    Uses openpyxl's write-only mode, which streams each row to disk as it is appended, and converts
+    the DataFrame chunk by chunk, so memory use stays flat regardless of the number of rows. The
+    output matches DataFrame.to_excel(file_path, index=False).
+
+    Parameters:
+    - df (pd.DataFrame): The data to write.
+    - file_path (str): Path of the xlsx file.
+    - chunk_size (int): Number of rows converted to Python values at a time.
+    """
+    with metrics.stage('export') as stage:
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('Sheet1')
+
+        header_font = Font(bold=True)
+        header = []
+        for title in df.columns:
+            cell = WriteOnlyCell(sheet, value=str(title))
+            cell.font = header_font
+            header.append(cell)
+        sheet.append(header)
+
+        for start in range(0, len(df), chunk_size):
+            chunk = df.iloc[start:start + chunk_size]
+            for row in zip(*(cell_values(chunk[col]) for col in chunk.columns)):
+                sheet.append(row)
+
+        workbook.save(file_path)
+        stage.add_rows(len(df))
+
+
+def publish_results(fetcher, sheet_name, columns_df, rows_df, export_df, output_path, upload=True):
+    """
+    Uploads a report to a new Smartsheet while writing its Excel file at the same time.
+
+    The export runs on a background thread during the network upload, so the total time is
+    roughly the longer of the two rather than their sum. Errors from either side are raised
+    after both have finished.
+
+    Parameters:
+    - fetcher (SmartsheetFetcher): The fetcher used for the upload.
+    - sheet_name (str): Name of the Smartsheet to create.
+    - columns_df (pd.DataFrame): DataFrame whose columns define the new sheet.
+    - rows_df (pd.DataFrame): Rows added to the new sheet.
+    - export_df (pd.DataFrame): Data written to the Excel file.
+    - output_path (str): Path of the Excel file.
+    - upload (bool): Whether to upload; when False only the Excel file is written.
+
+    Returns:
+    - dict: 'create_response' and 'add_response' (None when not uploading) and the
+      'upload_seconds', 'export_seconds' and 'total_seconds' timings.
+    """
+    started = time.perf_counter()
+    result = {'create_response': None, 'add_response': None, 'upload_seconds': 0.0}
+
+    def export():
+        export_started = time.perf_counter()
+        write_excel_streaming(export_df, output_path)
+        return time.perf_counter() - export_started
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        export_future = executor.submit(export)
+        try:
+            if upload:
+                upload_started = time.perf_counter()
+                result['create_response'] = fetcher.create_new_sheet(sheet_name, columns_df)
+                sheet_id = result['create_response']['result']['id']
+                result['add_response'] = fetcher.add_rows_to_sheet(sheet_id, rows_df)
+                result['upload_seconds'] = time.perf_counter() - upload_started
+        finally:
+            # Always let the export finish; an upload error takes precedence over an export error
+            export_error = export_future.exception()
+        if export_error is not None:
+            raise export_error
+        result['export_seconds'] = export_future.result()
+
+    result['total_seconds'] = time.perf_counter() - started
+    logging.info(f"Published '{sheet_name}': upload {result['upload_seconds']:.3f}s, "
+                 f"export {result['export_seconds']:.3f}s, total {result['total_seconds']:.3f}s")
+    return result
@@ -0,0 +1,173 @@
+import json
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+
+
+class SheetCache:
+    """
+    An on-disk cache of parsed Smartsheet DataFrames keyed by sheet ID.
+
+    Each entry records the sheet version it was downloaded at, so a cached DataFrame is only
+    served while the sheet is unchanged on Smartsheet. DataFrames are stored as Parquet (falling
+    back to pickle for columns Arrow cannot represent), and entries are evicted by age and by
+    total size on disk.
+
+    Attributes:
+    - cache_dir (str): Directory holding the cached files and the index.
+    - max_bytes (int): Maximum total size of cached files before least recently used entries are evicted.
+    - max_age (float): Maximum age of an entry in seconds.
+    - hits (int): Number of lookups served from the cache.
+    - misses (int): Number of lookups that required a download.
+    """
+
+    INDEX_FILENAME = 'index.json'
+
+    def __init__(self, cache_dir, max_bytes=512 * 1024 * 1024, max_age=7 * 24 * 3600):
+        """
+        Initializes the cache, creating the cache directory if needed.
+
+        Parameters:
+        - cache_dir (str): Directory to store cached sheets in.
+        - max_bytes (int): Maximum total size of the cache in bytes.
+        - max_age (float): Maximum age of a cached sheet in seconds.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._index_path = os.path.join(self.cache_dir, self.INDEX_FILENAME)
+        self._index = self._load_index()
+        self._lock = threading.RLock()
+
+    def _load_index(self):
+        if not os.path.exists(self._index_path):
+            return {}
+        try:
+            with open(self._index_path, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Sheet cache index unreadable, starting empty: {e}")
+            return {}
+
+    def _save_index(self):
+        tmp_path = self._index_path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(self._index, file)
+        os.replace(tmp_path, self._index_path)
+
+    def _remove(self, key):
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            try:
+                os.remove(os.path.join(self.cache_dir, entry['file']))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self):
+        """
+        Removes expired entries, then least recently used entries until the cache fits in max_bytes.
+        """
+        now = time.time()
+        for key in [k for k, entry in self._index.items() if now - entry['stored_at'] > self.max_age]:
+            self._remove(key)
+
+        total = sum(entry['size'] for entry in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k]['last_access']):
+            if total <= self.max_bytes:
+                break
+            total -= self._index[key]['size']
+            self._remove(key)
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+        - dict: Hits, misses, number of entries and total size in bytes.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._index),
+                'bytes': sum(entry['size'] for entry in self._index.values())
+            }
+
+    def get(self, sheet_id, version):
+        """
+        Returns the cached DataFrame for a sheet if it was stored at the given version.
+
+        Parameters:
+        - sheet_id (str): The ID of the Smartsheet.
+        - version (int): The sheet's current version on Smartsheet.
+
+        Returns:
+        - pd.DataFrame or None: The cached data, or None on a miss.
+        """
+        with self._lock:
+            key = str(sheet_id)
+            entry = self._index.get(key)
+            df = None
+            if entry is not None and entry['version'] == version and time.time() - entry['stored_at'] <= self.max_age:
+                path = os.path.join(self.cache_dir, entry['file'])
+                try:
+                    df = pd.read_parquet(path) if entry['format'] == 'parquet' else pd.read_pickle(path)
+                except Exception as e:
+                    logging.warning(f"Failed to read cached sheet {sheet_id}, discarding it: {e}")
+                    self._remove(key)
+                    self._save_index()
+
+            if df is None:
+                self.misses += 1
+                logging.info(f"Sheet cache miss for {sheet_id} (version {version}); hits={self.hits} misses={self.misses}")
+                return None
+
+            entry['last_access'] = time.time()
+            self._save_index()
+            self.hits += 1
+            logging.info(f"Sheet cache hit for {sheet_id} (version {version}); hits={self.hits} misses={self.misses}")
+            return df
+
+    def put(self, sheet_id, version, df):
+        """
+        Stores a DataFrame for a sheet at the given version, replacing any older entry.
+
+        Parameters:
+        - sheet_id (str): The ID of the Smartsheet.
+        - version (int): The sheet version the data was downloaded at.
+        - df (pd.DataFrame): The parsed sheet data.
+        """
+        with self._lock:
+            key = str(sheet_id)
+            self._remove(key)
+
+            filename = f"{key}.parquet"
+            file_format = 'parquet'
+            try:
+                df.to_parquet(os.path.join(self.cache_dir, filename))
+            except (ImportError, ValueError, TypeError, NotImplementedError) as e:
+                # Mixed-type object columns cannot always be written as Parquet
+                logging.debug(f"Falling back to pickle for sheet {sheet_id}: {e}")
+                if os.path.exists(os.path.join(self.cache_dir, filename)):
+                    os.remove(os.path.join(self.cache_dir, filename))
+                filename = f"{key}.pkl"
+                file_format = 'pickle'
+                df.to_pickle(os.path.join(self.cache_dir, filename))
+
+            now = time.time()
+            self._index[key] = {
+                'version': version,
+                'file': filename,
+                'format': file_format,
+                'size': os.path.getsize(os.path.join(self.cache_dir, filename)),
+                'stored_at': now,
+                'last_access': now
+            }
+            self._evict()
+            self._save_index()
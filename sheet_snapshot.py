@@ -0,0 +1,61 @@
+import logging
+import os
+
+import pandas as pd
+
+
+class SheetSnapshotStore:
+    """
+    Stores row-level snapshots of Smartsheets on disk for incremental syncing.
+
+    A snapshot keeps every row of a sheet keyed by its Smartsheet row ID, together with the
+    sheet's column definitions and the time of the last sync, so later syncs only need the rows
+    modified since then.
+
+    Attributes:
+    - snapshot_dir (str): Directory holding one snapshot file per sheet.
+    """
+
+    def __init__(self, snapshot_dir):
+        """
+        Initializes the store, creating the snapshot directory if needed.
+
+        Parameters:
+        - snapshot_dir (str): Directory to store snapshots in.
+        """
+        self.snapshot_dir = snapshot_dir
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+
+    def _path(self, sheet_id):
+        return os.path.join(self.snapshot_dir, f"{sheet_id}.snapshot.pkl")
+
+    def load(self, sheet_id):
+        """
+        Loads the snapshot for a sheet.
+
+        Parameters:
+        - sheet_id (str): The ID of the Smartsheet.
+
+        Returns:
+        - dict or None: The snapshot with 'synced_at', 'columns' and 'rows' keys, or None if absent.
+        """
+        path = self._path(sheet_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_pickle(path)
+        except Exception as e:
+            logging.warning(f"Discarding unreadable snapshot for sheet {sheet_id}: {e}")
+            return None
+
+    def save(self, sheet_id, snapshot):
+        """
+        Saves the snapshot for a sheet, replacing the previous one atomically.
+
+        Parameters:
+        - sheet_id (str): The ID of the Smartsheet.
+        - snapshot (dict): The snapshot with 'synced_at', 'columns' and 'rows' keys.
+        """
+        path = self._path(sheet_id)
+        pd.to_pickle(snapshot, path + '.tmp')
+        os.replace(path + '.tmp', path)
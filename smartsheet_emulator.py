@@ -0,0 +1,365 @@
+import argparse
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+
+class SmartsheetEmulator:
+    """
+    A localhost stand-in for the parts of the Smartsheet API used by SmartsheetFetcher.
+
+    Supports listing sheets, getting a sheet (with page/pageSize, rowsModifiedSince and columnIds),
+    its version and columns, creating sheets and adding rows. Overlapping row writes to one sheet
+    are rejected with error 4004, as Smartsheet does. Latency and 429 throttling can be
+    configured so the fetcher's retry, pooling and concurrency paths can be load-tested offline.
+    Point a fetcher at it with SmartsheetFetcher(token, base_url=emulator.base_url).
+
+    Attributes:
+    - latency (float): Seconds added to every response.
+    - rate_limit (float): Requests per second allowed before answering 429, or None for no limit.
+    - retry_after (int): Value of the Retry-After header sent with 429 responses.
+    - request_counts (dict): Number of requests served per (method, endpoint) pair.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, rate_limit=None, retry_after=1):
+        """
+        Parameters:
+        - host (str): Interface to listen on.
+        - port (int): Port to listen on; 0 picks a free port.
+        - latency (float): Seconds added to every response.
+        - rate_limit (float): Requests per second allowed before answering 429.
+        - retry_after (int): Seconds sent in the Retry-After header of 429 responses.
+        """
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.request_counts = {}
+        self._sheets = {}
+        self._next_id = 1
+        self._forced_throttles = 0
+        self._writing = set()
+        self._lock = threading.Lock()
+        self._tokens = rate_limit or 0
+        self._last_refill = time.monotonic()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        """
+        Starts serving on a background thread.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops the server and releases its socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def throttle_next(self, count):
+        """
+        Answers the next `count` requests with 429, regardless of rate_limit.
+        """
+        with self._lock:
+            self._forced_throttles += count
+
+    # Sheet state
+
+    def _new_id(self):
+        new_id = self._next_id
+        self._next_id += 1
+        return new_id
+
+    @staticmethod
+    def _now():
+        return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    @staticmethod
+    def _json_value(value):
+        if value is None or (isinstance(value, float) and not np.isfinite(value)):
+            return None
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, (pd.Timestamp, datetime)):
+            return None if pd.isna(value) else value.strftime('%Y-%m-%d')
+        return value
+
+    def _make_rows(self, sheet, rows_values):
+        rows = []
+        for values in rows_values:
+            cells = [{'columnId': col['id'], 'value': self._json_value(value)} for col, value in zip(sheet['columns'], values)]
+            rows.append({'id': self._new_id(), 'modifiedAt': self._now(), 'cells': cells})
+        return rows
+
+    def add_sheet(self, name, column_titles, rows_values=()):
+        """
+        Adds a sheet.
+
+        Parameters:
+        - name (str): Sheet name.
+        - column_titles (list): Column titles; the first is the primary column.
+        - rows_values (iterable): One sequence of cell values per row, in column order.
+
+        Returns:
+        - int: The new sheet ID.
+        """
+        with self._lock:
+            sheet_id = self._new_id()
+            columns = [
+                {'id': self._new_id(), 'index': i, 'title': title, 'type': 'TEXT_NUMBER', 'primary': i == 0}
+                for i, title in enumerate(column_titles)
+            ]
+            sheet = {'id': sheet_id, 'name': name, 'version': 1, 'modifiedAt': self._now(), 'columns': columns, 'rows': []}
+            sheet['rows'] = self._make_rows(sheet, rows_values)
+            self._sheets[sheet_id] = sheet
+            return sheet_id
+
+    def add_sheet_from_dataframe(self, name, df):
+        """
+        Adds a sheet holding a DataFrame's columns and rows.
+
+        Returns:
+        - int: The new sheet ID.
+        """
+        return self.add_sheet(name, list(df.columns), df.itertuples(index=False, name=None))
+
+    def update_row(self, sheet_id, row_id, values):
+        """
+        Updates cells of a row by column title and bumps its modifiedAt and the sheet version.
+        """
+        with self._lock:
+            sheet = self._sheets[sheet_id]
+            titles = {col['title']: col['id'] for col in sheet['columns']}
+            row = next(row for row in sheet['rows'] if row['id'] == row_id)
+            for title, value in values.items():
+                cell = next(cell for cell in row['cells'] if cell['columnId'] == titles[title])
+                cell['value'] = self._json_value(value)
+            row['modifiedAt'] = self._now()
+            sheet['modifiedAt'] = row['modifiedAt']
+            sheet['version'] += 1
+
+    def delete_row(self, sheet_id, row_id):
+        """
+        Deletes a row and bumps the sheet version.
+        """
+        with self._lock:
+            sheet = self._sheets[sheet_id]
+            sheet['rows'] = [row for row in sheet['rows'] if row['id'] != row_id]
+            sheet['modifiedAt'] = self._now()
+            sheet['version'] += 1
+
+    def row_ids(self, sheet_id):
+        """
+        Returns the row IDs of a sheet in order.
+        """
+        with self._lock:
+            return [row['id'] for row in self._sheets[sheet_id]['rows']]
+
+    # Request handling
+
+    def _throttled(self):
+        with self._lock:
+            if self._forced_throttles:
+                self._forced_throttles -= 1
+                return True
+            if not self.rate_limit:
+                return False
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._last_refill) * self.rate_limit)
+            self._last_refill = now
+            if self._tokens < 1:
+                return True
+            self._tokens -= 1
+            return False
+
+    def _render_sheet(self, sheet, query):
+        rows = sheet['rows']
+        if 'rowsModifiedSince' in query:
+            since = query['rowsModifiedSince'][0]
+            rows = [row for row in rows if row['modifiedAt'] >= since]
+
+        column_ids = None
+        if 'columnIds' in query:
+            column_ids = {int(column_id) for column_id in query['columnIds'][0].split(',')}
+
+        total = len(sheet['rows'])
+        if 'page' in query or 'pageSize' in query:
+            page_size = int(query.get('pageSize', ['100'])[0])
+            page = int(query.get('page', ['1'])[0])
+            offset = (page - 1) * page_size
+        else:
+            page_size = len(rows)
+            offset = 0
+
+        positions = {row['id']: position for position, row in enumerate(sheet['rows'], start=1)}
+        rendered = []
+        for row in rows[offset:offset + page_size]:
+            cells = row['cells'] if column_ids is None else [cell for cell in row['cells'] if cell['columnId'] in column_ids]
+            rendered.append({'id': row['id'], 'rowNumber': positions[row['id']], 'modifiedAt': row['modifiedAt'], 'cells': cells})
+
+        columns = sheet['columns'] if column_ids is None else [col for col in sheet['columns'] if col['id'] in column_ids]
+        return {
+            'id': sheet['id'], 'name': sheet['name'], 'version': sheet['version'], 'modifiedAt': sheet['modifiedAt'],
+            'totalRowCount': total, 'columns': columns, 'rows': rendered
+        }
+
+    def _handle(self, method, path, query, body):
+        """
+        Returns (status, response body) for a request.
+        """
+        parts = [part for part in path.split('/') if part]
+        if parts[:1] == ['2.0']:
+            parts = parts[1:]
+        if not parts or parts[0] != 'sheets':
+            return 404, {'errorCode': 1006, 'message': 'Not Found'}
+
+        with self._lock:
+            if method == 'GET' and len(parts) == 1:
+                data = [{'id': sheet['id'], 'name': sheet['name']} for sheet in self._sheets.values()]
+                return 200, {'pageNumber': 1, 'totalCount': len(data), 'data': data}
+
+            if method == 'POST' and len(parts) == 1:
+                sheet_id = self._new_id()
+                columns = [
+                    {'id': self._new_id(), 'index': i, 'title': col['title'], 'type': col.get('type', 'TEXT_NUMBER'),
+                     'primary': bool(col.get('primary', False))}
+                    for i, col in enumerate(body['columns'])
+                ]
+                self._sheets[sheet_id] = {'id': sheet_id, 'name': body['name'], 'version': 1, 'modifiedAt': self._now(), 'columns': columns, 'rows': []}
+                return 200, {'message': 'SUCCESS', 'resultCode': 0, 'result': {'id': sheet_id, 'name': body['name'], 'columns': columns}}
+
+            sheet = self._sheets.get(int(parts[1])) if parts[1].isdigit() else None
+            if sheet is None:
+                return 404, {'errorCode': 1006, 'message': 'Not Found'}
+
+            if method == 'GET' and len(parts) == 2:
+                return 200, self._render_sheet(sheet, query)
+            if method == 'GET' and parts[2:] == ['version']:
+                return 200, {'version': sheet['version']}
+            if method == 'GET' and parts[2:] == ['columns']:
+                return 200, {'pageNumber': 1, 'totalCount': len(sheet['columns']), 'data': sheet['columns']}
+            if method == 'POST' and parts[2:] == ['rows']:
+                rows = body if isinstance(body, list) else [body]
+                added = []
+                for row in rows:
+                    added.append({'id': self._new_id(), 'modifiedAt': self._now(), 'cells': row.get('cells', [])})
+                sheet['rows'].extend(added)
+                sheet['modifiedAt'] = self._now()
+                sheet['version'] += 1
+                return 200, {'message': 'SUCCESS', 'resultCode': 0, 'result': added, 'version': sheet['version']}
+
+        return 404, {'errorCode': 1006, 'message': 'Not Found'}
+
+    def _make_handler(self):
+        emulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body, headers=None):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _dispatch(self, method):
+                url = urlparse(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+
+                endpoint = '/'.join('{id}' if part.isdigit() else part for part in url.path.split('/'))
+                with emulator._lock:
+                    key = (method, endpoint)
+                    emulator.request_counts[key] = emulator.request_counts.get(key, 0) + 1
+
+                if emulator._throttled():
+                    if emulator.latency:
+                        time.sleep(emulator.latency)
+                    self._send(429, {'errorCode': 4003, 'message': 'Rate limit exceeded.'},
+                               {'Retry-After': str(emulator.retry_after)})
+                    return
+
+                # Like Smartsheet, reject a write to a sheet while another write to it is in progress
+                parts = [part for part in url.path.split('/') if part]
+                written_sheet = parts[-2] if method == 'POST' and parts[-1:] == ['rows'] else None
+                if written_sheet is not None:
+                    with emulator._lock:
+                        busy = written_sheet in emulator._writing
+                        if not busy:
+                            emulator._writing.add(written_sheet)
+                    if busy:
+                        self._send(409, {'errorCode': 4004, 'message': 'Request failed because sheetId '
+                                         f'{written_sheet} is currently being updated by another request.'})
+                        return
+                try:
+                    if emulator.latency:
+                        time.sleep(emulator.latency)
+                    status, response = emulator._handle(method, url.path, parse_qs(url.query), body)
+                finally:
+                    if written_sheet is not None:
+                        with emulator._lock:
+                            emulator._writing.discard(written_sheet)
+                self._send(status, response)
+
+            def do_GET(self):
+                self._dispatch('GET')
+
+            def do_POST(self):
+                self._dispatch('POST')
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local Smartsheet API emulator.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests per second before answering 429")
+    parser.add_argument("--roster-rows", type=int, nargs='*', default=[10000], help="Sizes of generated roster sheets")
+    args = parser.parse_args()
+
+    from benchmarks.synthetic import generate_roster
+
+    emulator = SmartsheetEmulator(port=args.port, latency=args.latency, rate_limit=args.rate_limit)
+    for n_rows in args.roster_rows:
+        sheet_id = emulator.add_sheet_from_dataframe(f"Roster {n_rows}", generate_roster(n_rows))
+        print(f"Sheet {sheet_id}: Roster {n_rows} ({n_rows} rows)")
+    print(f"Smartsheet emulator listening on {emulator.base_url}/2.0")
+    emulator.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        emulator.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,197 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from instrumentation import metrics, timed
+from result_sink import cell_values
+
+
+def get_bearer_token(file_path):
+    """
+    Reads the Smartsheet API bearer token from a config file containing a BEARER_TOKEN= line.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Config file not found at {file_path}")
+    
+    with open(file_path, 'r') as file:
+        for line in file:
+            if line.startswith("BEARER_TOKEN="):
+                return line.strip().split('=', 1)[1]
+    
+    raise ValueError("BEARER_TOKEN not found in the config file")
+
+
+class SmartsheetAPIError(Exception):
+    """
+    Raised when Smartsheet answers a request with an error, e.g. an unknown or inaccessible sheet.
+    """
+
+
+class RateLimiter:
+    """
+    A thread-safe limiter that spaces calls evenly to stay under a requests-per-second budget.
+    """
+
+    def __init__(self, rate):
+        """
+        Parameters:
+        rate (float): Maximum number of calls per second.
+        """
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_time = time.monotonic()
+
+    def wait(self):
+        """
+        Blocks until the caller is allowed to make its next call.
+        """
+        with self._lock:
+            now = time.monotonic()
+            scheduled = max(now, self._next_time)
+            self._next_time = scheduled + self.interval
+        if scheduled > now:
+            time.sleep(scheduled - now)
+
+
+class SmartsheetRetry(Retry):
+    """
+    A retry policy that never repeats a POST the server may already have applied.
+
+    GETs are retried on read errors and on throttled (429) and transient server errors (502, 503,
+    504). A POST that timed out or got a gateway error may still have added its rows or created its
+    sheet, so retrying it could duplicate them; POSTs are only retried when throttled or when the
+    connection could not be made, as the request was then never processed.
+    """
+
+    POST_STATUS_FORCELIST = frozenset([429])
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method and method.upper() == 'POST':
+            return status_code in self.POST_STATUS_FORCELIST
+        return super().is_retry(method, status_code, has_retry_after)
+
 
 class SmartsheetFetcher:
     """
     A class to interact with the Smartsheet API and fetch sheet data as Pandas DataFrames.
     """
 
-    def __init__(self, bearer_token):
+    BASE_URL = 'https://api.smartsheet.com/2.0'
+
+    def __init__(self, bearer_token, base_url=BASE_URL, pool_size=10, timeout=(5, 60),
+                 max_retries=5, backoff_factor=0.5, cache=None, max_workers=4, rate_limit=None,
+                 snapshot_store=None):
         """
         Initializes the SmartsheetFetcher with the required API bearer token.
 
+        All requests go through one pooled HTTP session, so connections to the API are kept
+        alive and reused across calls. Throttled (429) and transient server errors are retried
+        with exponential backoff, honouring the Retry-After header when Smartsheet sends one.
+        POSTs are only retried when throttled, so a timed-out upload is never applied twice.
+
         Parameters:
         bearer_token (str): The Smartsheet API bearer token for authorization.
+        base_url (str): Root URL of the Smartsheet API. Override to point at a local stub server.
+        pool_size (int): Maximum number of keep-alive connections held in the pool.
+        timeout (float or tuple): Connect and read timeout in seconds for every request.
+        max_retries (int): Maximum number of retries for throttled or failed requests.
+        backoff_factor (float): Base delay in seconds for the exponential backoff between retries.
+        cache (SheetCache): Optional on-disk cache used by fetch_smartsheet_data.
+        max_workers (int): Maximum number of concurrent downloads used by fetch_many.
+        rate_limit (float): Optional cap on API requests per second across all threads.
+        snapshot_store (SheetSnapshotStore): Optional row-level snapshot store used by sync_smartsheet_data.
         """
         self.bearer_token = bearer_token
+        self.cache = cache
+        self.snapshot_store = snapshot_store
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self._column_maps = {}
+        self._column_maps_lock = threading.Lock()
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
         self.headers = {
             'Authorization': f'Bearer {self.bearer_token}'
         }
 
+        # Read errors are only retried for GETs; see SmartsheetRetry for how POSTs are handled
+        retry = SmartsheetRetry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the pooled HTTP session and releases its connections.
+        """
+        self.session.close()
+
+    def _request(self, method, path, **kwargs):
+        """
+        Sends a request through the pooled session.
+
+        Parameters:
+        method (str): HTTP method, e.g. 'GET' or 'POST'.
+        path (str): API path relative to base_url, e.g. '/sheets'.
+
+        Returns:
+        requests.Response: The final response after any retries.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait()
+        response = self.session.request(method, f'{self.base_url}{path}', **kwargs)
+        if metrics.enabled:
+            retries = getattr(response.raw, 'retries', None)
+            metrics.count('http.requests')
+            metrics.count('http.retries', len(retries.history) if retries is not None else 0)
+            metrics.count('http.bytes_sent', len(response.request.body or b''))
+            metrics.count('http.bytes_received', len(response.content))
+        return response
+
+    @staticmethod
+    def _raise_for_error(response, action):
+        """
+        Raises SmartsheetAPIError with Smartsheet's error code and message if a request failed.
+
+        Parameters:
+        response (requests.Response): The response to check.
+        action (str): What was being done, for the error message, e.g. 'fetch sheet 123'.
+        """
+        if response.ok:
+            return
+        try:
+            error = response.json()
+        except ValueError:
+            error = {}
+        raise SmartsheetAPIError(
+            f"Could not {action}: HTTP {response.status_code}, "
+            f"Smartsheet error {error.get('errorCode', 'unknown')}: {error.get('message', response.reason)}"
+        )
+
     def fetch_all_sheets(self):
         """
         Fetches all available sheets and returns their data in a dictionary of DataFrames.
@@ -25,8 +199,7 @@ class SmartsheetFetcher:
         Returns:
         dict: A dictionary where each key is the sheet name, and each value is a DataFrame containing the sheet's data.
         """
-        url = 'https://api.smartsheet.com/2.0/sheets'
-        response = requests.get(url, headers=self.headers)
+        response = self._request('GET', '/sheets')
         sheets_data = response.json().get('data', [])
         
         all_sheets_data = {}
@@ -38,33 +211,291 @@ class SmartsheetFetcher:
         
         return all_sheets_data
 
-    def fetch_smartsheet_data(self, sheet_id):
+    def fetch_sheet_version(self, sheet_id):
+        """
+        Fetches the current version number of a sheet without downloading its rows.
+
+        Parameters:
+        sheet_id (str): The ID of the Smartsheet.
+
+        Returns:
+        int: The sheet version, which changes whenever the sheet is modified.
+        """
+        response = self._request('GET', f'/sheets/{sheet_id}/version')
+        self._raise_for_error(response, f"fetch the version of sheet {sheet_id}")
+        return response.json()['version']
+
+    @staticmethod
+    def apply_schema(df, schema):
+        """
+        Converts DataFrame columns to the types declared in a report schema.
+
+        Columns missing from the DataFrame are skipped. Date columns are parsed from Smartsheet's
+        ISO 8601 strings, with empty cells becoming NaT.
+
+        Parameters:
+        df (pd.DataFrame): The sheet data as parsed from the API.
+        schema (dict): Mapping of column title to dtype, e.g. MonthsWorked.SCHEMA.
+
+        Returns:
+        pd.DataFrame: The DataFrame with typed columns.
+        """
+        if not schema:
+            return df
+        df = df.copy()
+        for col, dtype in schema.items():
+            if col not in df.columns:
+                continue
+            if str(dtype).startswith('datetime64'):
+                if not pd.api.types.is_datetime64_any_dtype(df[col]):
+                    df[col] = pd.to_datetime(df[col], format='ISO8601')
+            elif dtype == 'category':
+                df[col] = df[col].astype('category')
+            else:
+                df[col] = pd.to_numeric(df[col]).astype(dtype)
+        return df
+
+    def fetch_smartsheet_data(self, sheet_id, schema=None):
         """
         Fetches Smartsheet data and returns it as a Pandas DataFrame.
 
+        If a cache is configured, the sheet version is checked first and the full sheet is only
+        downloaded when it has changed since it was cached.
+
         Parameters:
         sheet_id (str): The ID of the Smartsheet to fetch data from.
+        schema (dict): Optional column types to apply, e.g. MonthsWorked.SCHEMA.
 
         Returns:
         pd.DataFrame: DataFrame containing the sheet's data.
         """
-        url = f'https://api.smartsheet.com/2.0/sheets/{sheet_id}'
-        
-        response = requests.get(url, headers=self.headers)
-        sheet_data = response.json()
-        
-        columns = {col['id']: col['title'] for col in sheet_data['columns']}
-        data = []
-        
-        for row in sheet_data['rows']:
-            row_data = {columns[cell['columnId']]: cell.get('value', None) for cell in row['cells']}
-            data.append(row_data)
-        
-        df = pd.DataFrame(data)
-        df = df.dropna(how='all')
+        version = None
+        if self.cache is not None:
+            version = self.fetch_sheet_version(sheet_id)
+            cached_df = self.cache.get(sheet_id, version)
+            if cached_df is not None:
+                return self.apply_schema(cached_df, schema)
+
+        with metrics.stage('fetch'):
+            response = self._request('GET', f'/sheets/{sheet_id}')
+        self._raise_for_error(response, f"fetch sheet {sheet_id}")
+        with metrics.stage('parse'):
+            sheet_data = response.json()
+
+        with metrics.stage('dataframe') as stage:
+            df = self._rows_to_dataframe(sheet_data['columns'], sheet_data['rows'])
+            stage.add_rows(len(df))
+
+        if self.cache is not None:
+            self.cache.put(sheet_id, sheet_data.get('version', version), df)
         
-        return df
+        with metrics.stage('dataframe.schema'):
+            return self.apply_schema(df, schema)
     
+    @staticmethod
+    def _rows_to_dataframe(columns, rows, start=0, drop_empty=True):
+        """
+        Converts Smartsheet rows to a DataFrame by filling one value array per column.
+
+        Parameters:
+        columns (list): The sheet's column definitions.
+        rows (list): The sheet rows to convert.
+        start (int): Index label of the first row, so chunks of one sheet get consecutive labels.
+        drop_empty (bool): Whether to drop rows whose cells are all empty.
+
+        Returns:
+        pd.DataFrame: DataFrame of the rows.
+        """
+        titles = {col['id']: col['title'] for col in columns}
+        values = {title: [None] * len(rows) for title in titles.values()}
+
+        for position, row in enumerate(rows):
+            for cell in row['cells']:
+                values[titles[cell['columnId']]][position] = cell.get('value', None)
+
+        df = pd.DataFrame(values, index=pd.RangeIndex(start, start + len(rows)))
+        return df.dropna(how='all') if drop_empty else df
+
+    def iter_smartsheet_data(self, sheet_id, page_size=5000, schema=None):
+        """
+        Streams a sheet page by page, yielding one DataFrame chunk per page.
+
+        Only one page of the sheet JSON is held in memory at a time, which keeps peak memory
+        bounded for very large sheets. Concatenating the chunks gives the same DataFrame as
+        fetch_smartsheet_data.
+
+        Parameters:
+        sheet_id (str): The ID of the Smartsheet to fetch data from.
+        page_size (int): Number of rows requested per page.
+        schema (dict): Optional column types to apply to each chunk.
+
+        Yields:
+        pd.DataFrame: The non-empty rows of each page.
+        """
+        page = 1
+        fetched = 0
+        while True:
+            with metrics.stage('fetch'):
+                response = self._request('GET', f'/sheets/{sheet_id}', params={'page': page, 'pageSize': page_size})
+            self._raise_for_error(response, f"fetch page {page} of sheet {sheet_id}")
+            with metrics.stage('parse'):
+                sheet_data = response.json()
+            rows = sheet_data.get('rows', [])
+            if not rows:
+                break
+
+            with metrics.stage('dataframe') as stage:
+                chunk = self.apply_schema(self._rows_to_dataframe(sheet_data['columns'], rows, start=fetched), schema)
+                stage.add_rows(len(chunk))
+            yield chunk
+
+            fetched += len(rows)
+            if fetched >= sheet_data.get('totalRowCount', 0):
+                break
+            page += 1
+
+    ROW_NUMBER_COLUMN = '__rowNumber__'
+    SYNC_OVERLAP = pd.Timedelta(minutes=1)
+
+    def _rows_to_snapshot_frame(self, columns, rows):
+        """
+        Converts Smartsheet rows to a snapshot DataFrame indexed by row ID, keeping empty rows
+        and each row's position in the sheet.
+        """
+        df = self._rows_to_dataframe(columns, rows, drop_empty=False)
+        df.index = pd.Index([row['id'] for row in rows], name='rowId')
+        df[self.ROW_NUMBER_COLUMN] = [row.get('rowNumber', 0) for row in rows]
+        return df
+
+    def _snapshot_to_dataframe(self, snapshot_rows):
+        """
+        Converts a snapshot DataFrame back to the layout returned by fetch_smartsheet_data.
+        """
+        df = snapshot_rows.sort_values(self.ROW_NUMBER_COLUMN, kind='stable')
+        df = df.drop(columns=self.ROW_NUMBER_COLUMN).reset_index(drop=True)
+        return df.dropna(how='all')
+
+    @staticmethod
+    def _server_modified_at(sheet_data, previous=None):
+        """
+        Returns the sheet's last modification time as reported by Smartsheet: the sheet's
+        modifiedAt, or else the latest row modifiedAt in the response, never earlier than the
+        previous sync.
+        """
+        timestamps = [sheet_data.get('modifiedAt')] + [row.get('modifiedAt') for row in sheet_data.get('rows', [])]
+        timestamps = [pd.Timestamp(value) for value in timestamps if value]
+        timestamps = [value.tz_localize('UTC') if value.tzinfo is None else value.tz_convert('UTC') for value in timestamps]
+        if previous is not None:
+            timestamps.append(previous)
+        return max(timestamps) if timestamps else None
+
+    def sync_smartsheet_data(self, sheet_id, schema=None):
+        """
+        Fetches Smartsheet data incrementally against the local snapshot of the sheet.
+
+        The first sync downloads the full sheet. Later syncs request only the rows modified since
+        the previous sync with rowsModifiedSince and merge them into the snapshot. When the sheet's
+        total row count shows rows were deleted, a single-column listing of row IDs is fetched to
+        drop them. A change to the sheet's columns triggers a full download.
+
+        The rowsModifiedSince watermark is the modification time Smartsheet reports for the sheet,
+        not the local clock, so a client clock running ahead of the server cannot skip edits.
+
+        Parameters:
+        sheet_id (str): The ID of the Smartsheet to sync.
+        schema (dict): Optional column types to apply, e.g. MonthsWorked.SCHEMA.
+
+        Returns:
+        pd.DataFrame: DataFrame containing the sheet's data, as returned by fetch_smartsheet_data.
+        """
+        if self.snapshot_store is None:
+            raise ValueError("sync_smartsheet_data requires a snapshot_store")
+
+        snapshot = self.snapshot_store.load(sheet_id)
+        if snapshot is not None and snapshot.get('synced_at') is None:
+            snapshot = None  # No server timestamp was seen yet, e.g. the sheet was empty
+
+        if snapshot is not None:
+            since = (snapshot['synced_at'] - self.SYNC_OVERLAP).strftime('%Y-%m-%dT%H:%M:%SZ')
+            response = self._request('GET', f'/sheets/{sheet_id}', params={'rowsModifiedSince': since})
+            self._raise_for_error(response, f"sync sheet {sheet_id}")
+            sheet_data = response.json()
+            if [col['id'] for col in sheet_data['columns']] != [col['id'] for col in snapshot['columns']]:
+                logging.info(f"Columns of sheet {sheet_id} changed since last sync; downloading in full")
+                snapshot = None
+
+        if snapshot is None:
+            response = self._request('GET', f'/sheets/{sheet_id}')
+            self._raise_for_error(response, f"sync sheet {sheet_id}")
+            sheet_data = response.json()
+            rows = self._rows_to_snapshot_frame(sheet_data['columns'], sheet_data['rows'])
+            logging.info(f"Full sync of sheet {sheet_id}: {len(rows)} rows")
+        else:
+            modified = self._rows_to_snapshot_frame(sheet_data['columns'], sheet_data['rows'])
+            rows = snapshot['rows']
+            inserted = modified[~modified.index.isin(rows.index)]
+            appended_only = inserted.empty or rows.empty or (
+                inserted[self.ROW_NUMBER_COLUMN].min() > rows[self.ROW_NUMBER_COLUMN].max()
+            )
+            unchanged = rows[~rows.index.isin(modified.index)]
+            rows = pd.concat([unchanged, modified]) if not (unchanged.empty or modified.empty) else (
+                modified if unchanged.empty else unchanged
+            )
+
+            # Upserting every modified row means the snapshot can only be larger than the sheet
+            # if rows were deleted. Deletions and mid-sheet inserts both need the current row
+            # order, which a single-column listing provides cheaply.
+            deleted = 0
+            if len(rows) != sheet_data.get('totalRowCount', len(rows)) or not appended_only:
+                first_column = sheet_data['columns'][0]['id']
+                response = self._request('GET', f'/sheets/{sheet_id}', params={'columnIds': first_column})
+                self._raise_for_error(response, f"list the rows of sheet {sheet_id}")
+                row_positions = {row['id']: position for position, row in enumerate(response.json()['rows'], start=1)}
+                deleted = int((~rows.index.isin(list(row_positions))).sum())
+                rows = rows[rows.index.isin(list(row_positions))].copy()
+                rows[self.ROW_NUMBER_COLUMN] = rows.index.map(row_positions)
+            logging.info(f"Incremental sync of sheet {sheet_id}: {len(modified)} modified rows, {deleted} deleted rows")
+
+        previous = None if snapshot is None else snapshot['synced_at']
+        self.snapshot_store.save(sheet_id, {
+            'synced_at': self._server_modified_at(sheet_data, previous),
+            'columns': sheet_data['columns'],
+            'rows': rows
+        })
+        return self.apply_schema(self._snapshot_to_dataframe(rows), schema)
+
+    def fetch_many(self, sheet_ids, max_workers=None, schema=None, return_exceptions=False):
+        """
+        Fetches several sheets concurrently on a bounded thread pool.
+
+        Parameters:
+        sheet_ids (list): The IDs of the Smartsheets to fetch.
+        max_workers (int): Maximum concurrent downloads. Defaults to the fetcher's max_workers.
+        schema (dict): Optional column types to apply to every sheet.
+        return_exceptions (bool): Whether a sheet that fails to download maps to its exception
+            instead of the error being raised, so the other sheets are still returned.
+
+        Returns:
+        dict: A dictionary mapping each sheet ID to its DataFrame (or exception).
+        """
+        sheet_ids = list(dict.fromkeys(sheet_ids))
+        if not sheet_ids:
+            return {}
+
+        def fetch(sheet_id):
+            try:
+                return self.fetch_smartsheet_data(sheet_id, schema)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                logging.error(f"Could not fetch sheet {sheet_id}: {e}")
+                return e
+
+        workers = min(max_workers or self.max_workers, len(sheet_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            data_frames = executor.map(fetch, sheet_ids)
+            return dict(zip(sheet_ids, data_frames))
+
     # Function to clean invalid JSON values
     def clean_payload(self, data):
         if isinstance(data, dict):
@@ -79,6 +510,7 @@ class SmartsheetFetcher:
             return data
 
 
+    @timed('upload.create_sheet')
     def create_new_sheet(self, sheet_name, df):
         """
         Creates a new sheet with column definitions based on a DataFrame.
@@ -100,38 +532,209 @@ class SmartsheetFetcher:
         }
         
         # API endpoint to create a sheet
-        url = 'https://api.smartsheet.com/2.0/sheets'
-        response = requests.post(url, json=payload, headers=self.headers)
+        response = self._request('POST', '/sheets', json=payload)
+        create_response = response.json()
+
+        # Remember the new sheet's column IDs so appends don't need to look them up
+        result = create_response.get('result', {})
+        if 'id' in result and 'columns' in result:
+            self._store_column_map(result['id'], result['columns'])
         
         # Return the response (sheet details)
-        return response.json()
+        return create_response
+
+    def _store_column_map(self, sheet_id, columns):
+        """
+        Caches a sheet's column map and returns it. An empty map is never cached, as every sheet
+        has at least its primary column.
+        """
+        column_map = {col['title']: col['id'] for col in columns}
+        if column_map:
+            with self._column_maps_lock:
+                self._column_maps[str(sheet_id)] = column_map
+        return column_map
 
-    def add_rows_to_sheet(self, sheet_id, df):
+    def fetch_column_map(self, sheet_id):
+        """
+        Returns the column title to column ID mapping for a sheet.
+
+        The mapping is served from the fetcher's column metadata cache when the sheet was created
+        or looked up earlier; otherwise only the sheet's columns are requested, never its rows.
+
+        Parameters:
+        sheet_id (str): The ID of the Smartsheet.
+
+        Returns:
+        dict: Mapping of column title to column ID.
+        """
+        start_time = time.perf_counter()
+        with self._column_maps_lock:
+            column_map = self._column_maps.get(str(sheet_id))
+        if column_map is not None:
+            logging.debug(f"Column map for sheet {sheet_id} served from cache")
+            return column_map
+
+        response = self._request('GET', f'/sheets/{sheet_id}/columns', params={'includeAll': 'true'})
+        self._raise_for_error(response, f"fetch the columns of sheet {sheet_id}")
+        column_map = self._store_column_map(sheet_id, response.json().get('data', []))
+        if not column_map:
+            raise SmartsheetAPIError(f"Sheet {sheet_id} returned no columns")
+        logging.info(f"Fetched column map for sheet {sheet_id} in {time.perf_counter() - start_time:.3f}s")
+        return column_map
+
+    def _column_values(self, series):
+        """
+        Converts a DataFrame column to a list of JSON-safe Python values, replacing NaN, NaT and
+        Infinity with None and formatting dates as 'YYYY-MM-DD'.
+        """
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series.dt.strftime('%Y-%m-%d').astype(object).where(series.notna(), None).tolist()
+        values = cell_values(series)
+        return values if pd.api.types.is_float_dtype(series) else self.clean_payload(values)
+
+    def build_row_payloads(self, df, column_map):
+        """
+        Builds the Smartsheet row payloads for a DataFrame column by column.
+
+        Parameters:
+        df (pd.DataFrame): The DataFrame containing the data to add as rows.
+        column_map (dict): Mapping of column title to Smartsheet column ID.
+
+        Returns:
+        list: One {'cells': [...]} dictionary per DataFrame row.
+        """
+        columns = [col for col in df.columns if col in column_map]
+        if not columns:
+            return [{'cells': []} for _ in range(len(df))]
+
+        column_ids = [column_map[col] for col in columns]
+        column_values = [self._column_values(df[col]) for col in columns]
+
+        return [
+            {'cells': [{'columnId': column_id, 'value': value} for column_id, value in zip(column_ids, row_values)]}
+            for row_values in zip(*column_values)
+        ]
+
+    def _iter_row_payloads(self, df, column_map, chunk_size):
+        """
+        Yields the row payloads of a DataFrame, building them one slice of rows at a time.
+        """
+        for start in range(0, len(df), chunk_size):
+            yield from self.build_row_payloads(df.iloc[start:start + chunk_size], column_map)
+
+    @staticmethod
+    def _split_batches(rows, batch_size, max_batch_bytes):
+        """
+        Groups row payloads into batches of at most batch_size rows and roughly max_batch_bytes of JSON.
+        """
+        current = []
+        current_bytes = 0
+        for row in rows:
+            row_bytes = len(json.dumps(row, default=str))
+            if current and (len(current) >= batch_size or current_bytes + row_bytes > max_batch_bytes):
+                yield current
+                current = []
+                current_bytes = 0
+            current.append(row)
+            current_bytes += row_bytes
+        if current:
+            yield current
+
+    def _post_row_batch(self, sheet_id, batch_number, batch):
+        """
+        Posts one batch of rows and returns (batch_number, response JSON or None, latency in seconds).
+        """
+        start_time = time.perf_counter()
+        try:
+            response = self._request('POST', f'/sheets/{sheet_id}/rows', json=batch)
+            result = response.json()
+            if not response.ok or result.get('resultCode', 0) != 0:
+                logging.error(f"Row batch {batch_number} for sheet {sheet_id} failed: {result}")
+                result = None
+        except (requests.RequestException, ValueError) as e:
+            logging.error(f"Row batch {batch_number} for sheet {sheet_id} failed: {e}")
+            result = None
+        latency = time.perf_counter() - start_time
+        logging.info(f"Row batch {batch_number} ({len(batch)} rows) for sheet {sheet_id} took {latency:.3f}s")
+        return batch_number, result, latency
+
+    @timed('upload')
+    def add_rows_to_sheet(self, sheet_id, df, batch_size=500, max_batch_bytes=4 * 1024 * 1024,
+                          completed_batches=None):
         """
         Adds rows to an existing Smartsheet based on a DataFrame.
 
+        Rows are sent in batches of bounded size, one request at a time and in DataFrame order:
+        Smartsheet rejects overlapping writes to the same sheet, and sequential batches keep the
+        sheet's rows in order. Each batch is built while the previous one uploads.
+
+        Batches are numbered deterministically for a given DataFrame and batch limits. When a batch
+        fails, the batches after it are not sent, so a partially failed upload can be resumed in
+        order by passing the returned 'completedBatches' back in.
+
         Parameters:
         sheet_id (str): The ID of the Smartsheet.
         df (pd.DataFrame): The DataFrame containing the data to add as rows.
+        batch_size (int): Maximum number of rows per request.
+        max_batch_bytes (int): Approximate maximum JSON size of one request.
+        completed_batches (list): Batch numbers already uploaded by a previous call, which are skipped.
 
         Returns:
-        dict: The API response indicating success or failure.
+        dict: A Smartsheet-style response with 'message' ('SUCCESS' or 'PARTIAL_SUCCESS'), the added
+        rows in 'result', plus 'completedBatches', 'failedBatches' (the failed batch and every
+        batch after it) and 'rowsPerSecond'.
         """
-        # Fetch the column IDs for the sheet
-        url = f'https://api.smartsheet.com/2.0/sheets/{sheet_id}'
-        response = requests.get(url, headers=self.headers)
-        sheet_data = response.json()
-        column_map = {col['title']: col['id'] for col in sheet_data['columns']}
-        
-        # Convert DataFrame rows to Smartsheet row format
-        rows_to_add = []
-        for _, row in df.iterrows():
-            cells = [{'columnId': column_map[col], 'value': row[col]} for col in df.columns if col in column_map]
-            rows_to_add.append({'cells': cells})
-        
-        # Send the rows to Smartsheet
-        add_rows_url = f'https://api.smartsheet.com/2.0/sheets/{sheet_id}/rows'
-        payload = self.clean_payload(rows_to_add)
-        response = requests.post(add_rows_url, json=payload, headers=self.headers)
-        
-        return response.json()
\ No newline at end of file
+        # Look up the column IDs for the sheet
+        column_map = self.fetch_column_map(sheet_id)
+
+        # Convert DataFrame rows to Smartsheet row format lazily, batch by batch
+        batches = self._split_batches(self._iter_row_payloads(df, column_map, batch_size), batch_size, max_batch_bytes)
+
+        done = set(completed_batches or [])
+        added_rows = []
+        failed = []
+        rows_sent = 0
+        batches_sent = 0
+
+        def collect(future, row_count):
+            nonlocal rows_sent, batches_sent
+            number, result, _ = future.result()
+            if result is None:
+                failed.append(number)
+            else:
+                done.add(number)
+                added_rows.extend(result.get('result', []))
+                rows_sent += row_count
+                batches_sent += 1
+
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            in_flight = None
+            for number, batch in enumerate(batches):
+                if number in done:
+                    continue
+                if in_flight is not None:
+                    collect(*in_flight)
+                    in_flight = None
+                if failed:
+                    # Later batches wait for the failed one, so a resumed upload keeps the row order
+                    failed.append(number)
+                    continue
+                in_flight = (executor.submit(self._post_row_batch, sheet_id, number, batch), len(batch))
+            if in_flight is not None:
+                collect(*in_flight)
+        elapsed = time.perf_counter() - start_time
+
+        rows_per_second = rows_sent / elapsed if elapsed > 0 else 0.0
+        metrics.count('rows.uploaded', rows_sent)
+        logging.info(f"Uploaded {rows_sent} rows to sheet {sheet_id} in {batches_sent} batches "
+                     f"({elapsed:.3f}s, {rows_per_second:.1f} rows/s); {len(failed)} batches not uploaded")
+
+        return {
+            'message': 'PARTIAL_SUCCESS' if failed else 'SUCCESS',
+            'resultCode': 3 if failed else 0,
+            'result': added_rows,
+            'completedBatches': sorted(done),
+            'failedBatches': failed,
+            'rowsPerSecond': rows_per_second
+        }
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from clinic_turnover import ClinicTurnover
+
+
+def turnover_sheet(year, separations, headcount=20.0):
+    """
+    A yearly turnover sheet with one row per month, led by a year row and closed by a Total row.
+    """
+    month_start = pd.date_range(f"{year}-01-01", periods=12, freq='MS')
+    months = pd.DataFrame({
+        'Primary Column': month_start.strftime('%B'),
+        '# Separated Employees': separations,
+        'Avg # Employees': headcount,
+        'Month Start': month_start.strftime('%Y-%m-%d'),
+    })
+    year_row = pd.DataFrame({'Primary Column': [str(year)], '# Separated Employees': [None],
+                             'Avg # Employees': [None], 'Month Start': [None]})
+    total_row = pd.DataFrame({'Primary Column': ['Total'], '# Separated Employees': ["=SUM(C2:C13)"],
+                              'Avg # Employees': ["=AVERAGE(D2:D13)"], 'Month Start': [None]})
+    return pd.concat([year_row, months, total_row], ignore_index=True)
+
+
+def monthly_rows(sheet):
+    return sheet[sheet['Month Start'].notna()].reset_index(drop=True)
+
+
+def test_rolling_turnover_over_consecutive_years():
+    # Year and Total rows have no Month Start and are skipped
+    sheets = [turnover_sheet(2022, 1), turnover_sheet(2023, 2)]
+    result = ClinicTurnover.rolling_turnover(sheets)
+
+    assert len(result) == 13
+    assert result['# Separated Employees'].tolist() == [12 + 1 * i for i in range(13)]
+    np.testing.assert_allclose(result['Turnover'], result['# Separated Employees'] / 20.0)
+
+
+def test_rolling_turnover_later_sheet_wins_overlapping_months():
+    earlier = monthly_rows(turnover_sheet(2023, 1))
+    later = monthly_rows(turnover_sheet(2023, 3))
+    result = ClinicTurnover.rolling_turnover([earlier, later])
+
+    assert result['# Separated Employees'].tolist() == [36]
+
+
+def test_rolling_turnover_adds_rows_for_the_same_month_within_a_sheet():
+    sheet = monthly_rows(turnover_sheet(2023, 1, headcount=10.0))
+    sheet = pd.concat([sheet, sheet], ignore_index=True)
+    result = ClinicTurnover.rolling_turnover([sheet])
+
+    assert result['# Separated Employees'].tolist() == [24]
+    assert result['Avg # Employees'].tolist() == [20.0]
+
+
+def test_rolling_turnover_without_dated_months_is_empty():
+    undated = turnover_sheet(2023, 1)
+    undated = undated[undated['Month Start'].isna()]
+    empty = turnover_sheet(2023, 1).iloc[:0]
+
+    for sheets in ([undated], [empty], [undated, empty]):
+        result = ClinicTurnover.rolling_turnover(sheets)
+        assert result.empty
+        assert list(result.columns) == ['Window Start', 'Window End', '# Separated Employees', 'Avg # Employees', 'Turnover']
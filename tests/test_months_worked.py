@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from months_worked import MonthsWorked
+
+REPORT_WINDOWS = [
+    (datetime(2022, 7, 1), datetime(2023, 6, 30)),
+    (datetime(2022, 7, 15), datetime(2023, 7, 1)),
+    (datetime(2023, 1, 1), datetime(2023, 12, 31)),
+]
+
+
+def generate_roster(n_rows=2000, seed=7):
+    """
+    A random roster plus hand-picked rows for the edge cases of the month clamping rules.
+    """
+    rng = np.random.default_rng(seed)
+
+    def date():
+        return (datetime(2021, 1, 1) + timedelta(days=int(rng.integers(0, 1500)))).strftime('%Y-%m-%d')
+
+    rows = []
+    for i in range(n_rows):
+        leave_start = date() if rng.random() < 0.3 else None
+        rows.append({
+            'Cohen Clinic': 'Clinic A',
+            'Name': f"Employee {i}",
+            'Position': 'Clinician',
+            'FTE': [None, 1.0, 0.5, 0.8, 0.75][int(rng.integers(0, 5))],
+            'Start Date': date(),
+            'End Date': date() if rng.random() < 0.6 else None,
+            'Employee Leave (start date)': leave_start,
+            'Employee Leave (end date)': date() if leave_start and rng.random() < 0.6 else None,
+        })
+
+    edge_cases = [
+        # Start dates either side of the half-month cut-off
+        ('2022-09-15', None, None, None),
+        ('2022-09-16', None, None, None),
+        ('2023-03-15', '2023-05-20', None, None),
+        ('2023-03-16', '2023-05-20', None, None),
+        # End dates either side of the 15th, and past the report end
+        ('2022-01-10', '2023-02-14', None, None),
+        ('2022-01-10', '2023-02-15', None, None),
+        ('2022-01-10', '2024-03-01', None, None),
+        # Open leave ends the stint the day before the leave started
+        ('2022-01-10', None, '2023-02-20', None),
+        ('2022-08-03', None, '2022-08-01', None),
+        # Leave entirely before or after the report window, and straddling its edges
+        ('2021-05-01', None, '2021-06-01', '2021-09-30'),
+        ('2021-05-01', None, '2024-02-01', '2024-05-30'),
+        ('2021-05-01', None, '2022-05-01', '2022-09-30'),
+        ('2021-05-01', '2023-10-20', '2023-05-01', '2024-01-15'),
+        # Started after leaving
+        ('2023-04-20', '2023-04-25', None, None),
+    ]
+    for i, (start, end, leave_start, leave_end) in enumerate(edge_cases):
+        rows.append({
+            'Cohen Clinic': 'Clinic B', 'Name': f"Edge case {i}", 'Position': 'Intake', 'FTE': 0.5,
+            'Start Date': start, 'End Date': end,
+            'Employee Leave (start date)': leave_start, 'Employee Leave (end date)': leave_end,
+        })
+    return pd.DataFrame(rows)
+
+
+def per_row_months(calculator, df):
+    """
+    Months worked per row through calculate_months_in_period, called as the original get_results did.
+    """
+    months_worked = []
+    fte_adjusted_months = []
+    for _, row in df.iterrows():
+        months, fte_months, _ = calculator.calculate_months_in_period(
+            row['Start Date'],
+            row['End Date'] if pd.notna(row['End Date']) else None,
+            row['FTE'] if pd.notna(row['FTE']) else 1,
+            row['Position'],
+            row['Name'],
+            row['Employee Leave (start date)'],
+            row['Employee Leave (end date)'],
+        )
+        months_worked.append(months)
+        fte_adjusted_months.append(fte_months)
+    return np.array(months_worked), np.array(fte_adjusted_months, dtype=float)
+
+
+@pytest.mark.parametrize('report_start, report_end', REPORT_WINDOWS)
+@pytest.mark.parametrize('typed', [False, True], ids=['text dates', 'datetime columns'])
+def test_calculate_months_columnar_matches_per_row(report_start, report_end, typed):
+    df = generate_roster()
+    if typed:
+        date_columns = ['Start Date', 'End Date', 'Employee Leave (start date)', 'Employee Leave (end date)']
+        df[date_columns] = df[date_columns].apply(pd.to_datetime)
+    calculator = MonthsWorked(df, report_start, report_end)
+
+    months_worked, fte_adjusted_months = calculator.calculate_months_columnar(df)
+    expected_months, expected_fte_months = per_row_months(calculator, df)
+
+    np.testing.assert_array_equal(months_worked, expected_months)
+    np.testing.assert_allclose(fte_adjusted_months, expected_fte_months)
+
+
+def test_stint_index_lookups_match_roster_rows():
+    df = generate_roster()
+    df['Name'] = [f"Employee {i % 700}" for i in range(len(df))]
+    index = MonthsWorked(df, *REPORT_WINDOWS[0]).build_stint_index()
+
+    for name in df['Name'].unique():
+        expected = np.flatnonzero(df['Name'].to_numpy() == name)
+        np.testing.assert_array_equal(index.stints_of(name), expected)
+        assert index.has_multiple_entries(name) == (len(expected) > 1)
+    assert len(index.stints_of('Not on the roster')) == 0
+
+
+def test_evaluate_windows_matches_one_report_per_window():
+    df = generate_roster()
+    df['Position'] = [MonthsWorked.ROLES_TO_TRACK[i % 5] for i in range(len(df))]
+    windows = {f"{start:%Y-%m-%d} to {end:%Y-%m-%d}": (start, end) for start, end in REPORT_WINDOWS}
+    windows.update(MonthsWorked.quarter_windows('2023-01-01', '2023-12-31'))
+
+    summaries = MonthsWorked.summarize_windows(MonthsWorked.evaluate_windows(df, windows))
+
+    assert list(summaries['Window'].unique()) == list(windows)
+    for label, (start, end) in windows.items():
+        calculator = MonthsWorked(df, start, end)
+        grant_months = max((end.year - start.year) * 12 + end.month - start.month, 1)
+        expected = calculator.generate_clinic_summaries(calculator.get_results(), grant_months)
+        got = summaries[summaries['Window'] == label].drop(columns='Window').reset_index(drop=True)
+        pd.testing.assert_frame_equal(got, expected, check_dtype=False, check_names=False)
@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+
+from months_worked import MonthsWorked
+from result_sink import cell_values
+from sheet_snapshot import SheetSnapshotStore
+from smartsheet_emulator import SmartsheetEmulator
+from smartsheet_fetcher import SmartsheetAPIError, SmartsheetFetcher
+
+
+@pytest.fixture
+def emulator():
+    with SmartsheetEmulator() as emulator:
+        yield emulator
+
+
+def make_fetcher(emulator, **kwargs):
+    return SmartsheetFetcher('test-token', base_url=emulator.base_url, backoff_factor=0, **kwargs)
+
+
+def test_failed_column_lookup_is_raised_and_not_cached(emulator):
+    sheet_id = emulator.add_sheet('Roster', ['Name', 'FTE'])
+    df = pd.DataFrame({'Name': ['A', 'B', 'C'], 'FTE': [1.0, 0.5, 0.8]})
+
+    with make_fetcher(emulator, max_retries=0) as fetcher:
+        emulator.throttle_next(1)
+        with pytest.raises(SmartsheetAPIError):
+            fetcher.add_rows_to_sheet(sheet_id, df)
+        assert emulator.row_ids(sheet_id) == []
+
+        response = fetcher.add_rows_to_sheet(sheet_id, df)
+        assert response['message'] == 'SUCCESS'
+        pd.testing.assert_frame_equal(fetcher.fetch_smartsheet_data(sheet_id), df)
+
+
+def assert_sync_matches_fetch(fetcher, sheet_id):
+    pd.testing.assert_frame_equal(fetcher.sync_smartsheet_data(sheet_id), fetcher.fetch_smartsheet_data(sheet_id))
+
+
+@pytest.mark.parametrize('server_clock_offset', [0, -300], ids=['in sync', 'server 5 minutes behind'])
+def test_sync_matches_full_fetch_after_edits(emulator, tmp_path, monkeypatch, server_clock_offset):
+    now = SmartsheetEmulator._now
+    monkeypatch.setattr(SmartsheetEmulator, '_now', staticmethod(
+        lambda: (pd.Timestamp(now()) + pd.Timedelta(seconds=server_clock_offset)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    ))
+    sheet_id = emulator.add_sheet('Roster', ['Name', 'FTE'], [(f"Employee {i}", 1.0) for i in range(20)])
+
+    with make_fetcher(emulator, snapshot_store=SheetSnapshotStore(str(tmp_path))) as fetcher:
+        assert_sync_matches_fetch(fetcher, sheet_id)
+
+        row_ids = emulator.row_ids(sheet_id)
+        emulator.update_row(sheet_id, row_ids[3], {'FTE': 0.5})
+        emulator.update_row(sheet_id, row_ids[10], {'Name': 'Renamed'})
+        assert_sync_matches_fetch(fetcher, sheet_id)
+
+        emulator.delete_row(sheet_id, row_ids[0])
+        emulator.delete_row(sheet_id, row_ids[7])
+        assert_sync_matches_fetch(fetcher, sheet_id)
+
+        fetcher.add_rows_to_sheet(sheet_id, pd.DataFrame({'Name': ['New 1', 'New 2'], 'FTE': [0.8, 0.6]}))
+        emulator.update_row(sheet_id, row_ids[15], {'FTE': 0.25})
+        emulator.delete_row(sheet_id, row_ids[19])
+        assert_sync_matches_fetch(fetcher, sheet_id)
+
+        synced = fetcher.sync_smartsheet_data(sheet_id)
+        assert len(synced) == 19
+        assert synced['Name'].tolist()[-2:] == ['New 1', 'New 2']
+        assert synced.loc[synced['Name'] == 'Employee 3', 'FTE'].item() == 0.5
+
+
+def test_typed_fte_is_uploaded_and_exported_without_float32_noise():
+    df = SmartsheetFetcher.apply_schema(pd.DataFrame({'FTE': [0.8, 0.75, None]}), MonthsWorked.SCHEMA)
+    assert df['FTE'].dtype == 'float32'
+
+    payload = SmartsheetFetcher('test-token').build_row_payloads(df, {'FTE': 1})
+    assert [row['cells'][0]['value'] for row in payload] == [0.8, 0.75, None]
+    assert cell_values(df['FTE']) == [0.8, 0.75, None]
+    assert MonthsWorked.widen_floats(df['FTE'])[:2].tolist() == [0.8, 0.75]